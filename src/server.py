@@ -20,23 +20,29 @@ from mcp.types import TextContent
 from typing import Any
 
 # Import our tool modules
-from tools.api_tools import get_api_tool_definitions, handle_api_tool
-from tools.local import get_local_tool_definitions, handle_local_tool
+from tools.api_tools import get_api_tool_definitions, handle_api_tool, close_api_client
+from tools.local import get_local_tool_definitions, handle_local_tool, close_local_client
 
 
 # Create server
 app = Server("mealdb-server")
 
+# Combined tool list, built on the first list_tools call
+_all_tools = None
+
 
 @app.list_tools()
 async def list_tools():
     """List all available tools from both modules."""
-    api_tools = get_api_tool_definitions()
-    local_tools = get_local_tool_definitions()
-    
-    all_tools = api_tools + local_tools
+    global _all_tools
+    if _all_tools is None:
+        api_tools, local_tools = await asyncio.gather(
+            get_api_tool_definitions(),
+            get_local_tool_definitions(),
+        )
+        _all_tools = api_tools + local_tools
     
-    return all_tools
+    return _all_tools
 
 
 @app.call_tool()
@@ -61,12 +67,17 @@ async def main():
     """Run the MCP server."""
     from mcp.server.stdio import stdio_server
         
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options(),
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options(),
+            )
+    finally:
+        # Release pooled HTTP connections
+        await close_api_client()
+        await close_local_client()
 
 
 if __name__ == "__main__":
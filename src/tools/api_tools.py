@@ -3,22 +3,138 @@ API Tools - Fetching data from TheMealDB API
 All tools that interact with the external TheMealDB API.
 """
 
+import asyncio
+import functools
+import time
+
 import httpx
+import orjson
 from mcp.types import Tool, TextContent
-from typing import Any
+from typing import Any, Awaitable, Callable, Final, Optional
 
 
 API_BASE = "https://www.themealdb.com/api/json/v1/1"
 
+# Ask for compressed bodies explicitly; httpx decodes them transparently
+_HEADERS = {"Accept-Encoding": "gzip, deflate", "User-Agent": "mealdb-mcp/1.0"}
+
+# Shared HTTP client, created on first use so every tool call reuses the
+# same connection pool (and TLS session) instead of reconnecting.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared TheMealDB client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=API_BASE,
+            headers=_HEADERS,
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+    return _client
+
+
+# Cap on in-flight upstream requests so bursts of tool calls don't trip
+# TheMealDB's rate limiting. Like the client it is created on first use and
+# dropped by close_api_client(), since a semaphore binds to the event loop
+# that first waits on it.
+_MAX_CONCURRENT_REQUESTS = 8
+_request_slots: Optional[asyncio.Semaphore] = None
+
+
+def _get_request_slots() -> asyncio.Semaphore:
+    """Return the shared upstream request semaphore, creating it on first use."""
+    global _request_slots
+    if _request_slots is None:
+        _request_slots = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+    return _request_slots
+
+
+# In-process response cache for read-only endpoints:
+# (path, sorted params) -> (expires_at, parsed JSON, ETag, Last-Modified)
+_CACHE_TTL = 3600  # 1 hour for searches, lookups and filters
+_CACHE_LONG_TTL = 24 * 3600  # 24 hours for near-static lists
+_CACHE_MAXSIZE = 512
+_cache: dict[tuple, tuple[float, dict, Optional[str], Optional[str]]] = {}
+
+
+async def _get_json(client: httpx.AsyncClient, path: str, params: Optional[dict] = None,
+                    ttl: float = _CACHE_TTL) -> dict:
+    """
+    GET a TheMealDB endpoint and return the parsed JSON.
+    
+    Repeat requests for the same path and params are served from the cache
+    until their TTL expires. Expired entries are revalidated with a
+    conditional GET when the server sent an ETag or Last-Modified header;
+    a 304 reply reuses the cached body. Pass ttl=0 to bypass the cache entirely.
+    """
+    params = params or {}
+    key = (path, tuple(sorted(params.items())))
+    
+    headers = None
+    entry = _cache.get(key) if ttl else None
+    if entry is not None:
+        expires_at, cached, etag, last_modified = entry
+        if expires_at > time.monotonic():
+            return cached
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+    
+    async with _get_request_slots():
+        response = await client.get(path, params=params, headers=headers or None)
+    
+    if entry is not None and response.status_code == 304:
+        _cache[key] = (time.monotonic() + ttl, cached, etag, last_modified)
+        return cached
+    
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+    
+    if ttl:
+        if key not in _cache and len(_cache) >= _CACHE_MAXSIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del _cache[next(iter(_cache))]
+        _cache[key] = (
+            time.monotonic() + ttl,
+            data,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+    
+    return data
+
+
+async def close_api_client() -> None:
+    """Close the shared TheMealDB client (called on server shutdown)."""
+    global _client, _request_slots
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    _request_slots = None
+
+
+# list_all_ingredients output limits
+_MAX_INGREDIENTS = 100
+_MAX_DESC = 100
+
+# TheMealDB stores up to 20 ingredient/measure pairs as numbered fields
+_ING_KEYS = tuple(f"strIngredient{i}" for i in range(1, 21))
+_MEAS_KEYS = tuple(f"strMeasure{i}" for i in range(1, 21))
+
 
 def format_full_meal(meal: dict) -> str:
     """Format a full meal with all details."""
-    ingredients = []
-    for i in range(1, 21):
-        ingredient = meal.get(f"strIngredient{i}", "")
-        measure = meal.get(f"strMeasure{i}", "")
-        if ingredient and ingredient.strip():
-            ingredients.append(f"  - {measure.strip()} {ingredient.strip()}")
+    ingredients = [
+        f"  - {(meal.get(meas_key) or '').strip()} {ingredient}"
+        for ing_key, meas_key in zip(_ING_KEYS, _MEAS_KEYS)
+        if (ingredient := (meal.get(ing_key) or '').strip())
+    ]
     
     ingredients_text = "\n".join(ingredients) if ingredients else "No ingredients listed"
     
@@ -44,10 +160,16 @@ def format_full_meal(meal: dict) -> str:
 
 def format_meal_summary(meal: dict) -> str:
     """Format a brief meal summary with image link."""
-    meal_name = meal.get('strMeal', 'Unknown')
-    meal_id = meal.get('idMeal', 'N/A')
-    image_url = meal.get('strMealThumb', '')
-    
+    return _format_meal_summary(
+        meal.get('strMeal', 'Unknown'),
+        meal.get('idMeal', 'N/A'),
+        meal.get('strMealThumb', ''),
+    )
+
+
+@functools.lru_cache(maxsize=2048)
+def _format_meal_summary(meal_name: str, meal_id: str, image_url: str) -> str:
+    """Cached body of format_meal_summary, keyed on the fields it uses."""
     if image_url:
         summary = f"- **[{meal_name}]({image_url})** (ID: {meal_id})"
     else:
@@ -58,394 +180,444 @@ def format_meal_summary(meal: dict) -> str:
 
 def format_category(cat: dict) -> str:
     """Format a category with details."""
-    desc = cat.get('strCategoryDescription', 'No description')
+    return _format_category(
+        cat.get('strCategory', 'Unknown'),
+        cat.get('strCategoryDescription', 'No description'),
+        cat.get('strCategoryThumb', ''),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _format_category(name: str, desc: str, thumb_url: str) -> str:
+    """Cached body of format_category, keyed on the fields it uses."""
     if len(desc) > 200:
         desc = desc[:200] + "..."
     
-    thumb_url = cat.get('strCategoryThumb', '')
     thumb_section = f"\n🖼️ [View Category Image]({thumb_url})" if thumb_url else ""
     
-    return f"""## {cat.get('strCategory', 'Unknown')}{thumb_section}
+    return f"""## {name}{thumb_section}
 {desc}
 """
 
 
+def format_ingredient_line(ing: dict) -> str:
+    """Format one ingredient list entry with a trimmed description."""
+    name = ing.get('strIngredient', 'Unknown')
+    desc = ing.get('strDescription') or ''
+    if not desc:
+        return f"- **{name}**\n"
+    if len(desc) > _MAX_DESC:
+        desc = desc[:_MAX_DESC] + "..."
+    return f"- **{name}** - {desc}\n"
+
+
 # ============================================================================
 # TOOL DEFINITIONS
 # ============================================================================
 
-def get_api_tool_definitions() -> list[Tool]:
-    """Return all API tool definitions."""
-    return [
-        # Search & Lookup Tools
-        Tool(
-            name="search_meal_by_name",
-            description="Search for meals by name (e.g., 'Arrabiata', 'chicken', 'pasta') with urls for picture of each recipe.  After showing results, ask user if they want to: 1.see any specific recipe 2.to see all categories / all areas 3.recipes by ingredient/specific letter (a-z).",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {"type": "string", "description": "Meal name to search for"}
-                },
-                "required": ["name"]
+_API_TOOLS: list[Tool] = [
+    # Search & Lookup Tools
+    Tool(
+        name="search_meal_by_name",
+        description="Search for meals by name (e.g., 'Arrabiata', 'chicken', 'pasta') with urls for picture of each recipe.  After showing results, ask user if they want to: 1.see any specific recipe 2.to see all categories / all areas 3.recipes by ingredient/specific letter (a-z).",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "description": "Meal name to search for"}
             },
-        ),
-        Tool(
-            name="list_meals_by_first_letter",
-            description="List all meals starting with a specific letter (A-Z) with urls for picture of each recipe. After showing results, ask user if they want to: 1.see any specific recipe 2.to see all categories / all areas 3.recipes by ingredient/name.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "letter": {
-                        "type": "string",
-                        "description": "Single letter (A-Z)",
-                        "minLength": 1,
-                        "maxLength": 1
-                    }
-                },
-                "required": ["letter"]
+            "required": ["name"]
+        },
+    ),
+    Tool(
+        name="list_meals_by_first_letter",
+        description="List all meals starting with a specific letter (A-Z) with urls for picture of each recipe. After showing results, ask user if they want to: 1.see any specific recipe 2.to see all categories / all areas 3.recipes by ingredient/name.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "letter": {
+                    "type": "string",
+                    "description": "Single letter (A-Z)",
+                    "minLength": 1,
+                    "maxLength": 1
+                }
             },
-        ),
-        Tool(
-            name="lookup_meal_by_id",
-            description="Get full meal details by ID with url for picture of recipe. Use this to VIEW a recipe. After showing the recipe, ask if user wants to save it as a PDF and prepare shopping list.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "meal_id": {"type": "string", "description": "Meal ID (e.g., '52772')"}
-                },
-                "required": ["meal_id"]
+            "required": ["letter"]
+        },
+    ),
+    Tool(
+        name="lookup_meal_by_id",
+        description="Get full meal details by ID with url for picture of recipe. Use this to VIEW a recipe. After showing the recipe, ask if user wants to save it as a PDF and prepare shopping list.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "meal_id": {"type": "string", "description": "Meal ID (e.g., '52772')"}
             },
-        ),
-        Tool(
-            name="get_random_meal",
-            description="Get a single random meal for inspiration with url for picture recipe. After showing the recipe, ask if user wants 1.to save it as a PDF. 2.to create a shopping list. 3.to see another random meal. 4.to see all categories / all areas. 5.recipes by ingredient/specific letter (a-z).",
-            inputSchema={"type": "object", "properties": {}},
-        ),
-        
-        # Category & List Tools
-        Tool(
-            name="list_all_categories",
-            description="Get all meal categories with descriptions and images, after showing categories, ask user if they want to: see recipes in any specific category",
-            inputSchema={"type": "object", "properties": {}},
-        ),
-        Tool(
-            name="list_category_names",
-            description="Get just the category names (e.g., Seafood, Dessert, Vegetarian)",
-            inputSchema={"type": "object", "properties": {}},
-        ),
-        Tool(
-            name="list_area_names",
-            description="Get all cuisine/area names (e.g., Italian, Chinese, Mexican)",
-            inputSchema={"type": "object", "properties": {}},
-        ),
-        Tool(
-            name="list_all_ingredients",
-            description="Get all available ingredients in the database",
-            inputSchema={"type": "object", "properties": {}},
-        ),
-        
-        # Filter Tools
-        Tool(
-            name="filter_by_ingredient",
-            description="Find all meals that contain a specific ingredient with urls for picture of each recipe. After showing results, ask user if they want to: see any specific recipe ",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "ingredient": {
-                        "type": "string",
-                        "description": "Ingredient name (e.g., 'chicken_breast', 'garlic')"
-                    }
-                },
-                "required": ["ingredient"]
+            "required": ["meal_id"]
+        },
+    ),
+    Tool(
+        name="get_random_meal",
+        description="Get a single random meal for inspiration with url for picture recipe. After showing the recipe, ask if user wants 1.to save it as a PDF. 2.to create a shopping list. 3.to see another random meal. 4.to see all categories / all areas. 5.recipes by ingredient/specific letter (a-z).",
+        inputSchema={"type": "object", "properties": {}},
+    ),
+    
+    # Category & List Tools
+    Tool(
+        name="list_all_categories",
+        description="Get all meal categories with descriptions and images, after showing categories, ask user if they want to: see recipes in any specific category",
+        inputSchema={"type": "object", "properties": {}},
+    ),
+    Tool(
+        name="list_category_names",
+        description="Get just the category names (e.g., Seafood, Dessert, Vegetarian)",
+        inputSchema={"type": "object", "properties": {}},
+    ),
+    Tool(
+        name="list_area_names",
+        description="Get all cuisine/area names (e.g., Italian, Chinese, Mexican)",
+        inputSchema={"type": "object", "properties": {}},
+    ),
+    Tool(
+        name="list_all_ingredients",
+        description="Get all available ingredients in the database",
+        inputSchema={"type": "object", "properties": {}},
+    ),
+    
+    # Filter Tools
+    Tool(
+        name="filter_by_ingredient",
+        description="Find all meals that contain a specific ingredient with urls for picture of each recipe. After showing results, ask user if they want to: see any specific recipe ",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "ingredient": {
+                    "type": "string",
+                    "description": "Ingredient name (e.g., 'chicken_breast', 'garlic')"
+                }
             },
-        ),
-        Tool(
-            name="filter_by_category",
-            description="Find all meals in a specific category with urls for picture of each recipe. After showing results, ask user if they want to: see any specific recipe.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "category": {
-                        "type": "string",
-                        "description": "Category name (e.g., 'Seafood', 'Dessert')"
-                    }
-                },
-                "required": ["category"]
+            "required": ["ingredient"]
+        },
+    ),
+    Tool(
+        name="filter_by_category",
+        description="Find all meals in a specific category with urls for picture of each recipe. After showing results, ask user if they want to: see any specific recipe.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "category": {
+                    "type": "string",
+                    "description": "Category name (e.g., 'Seafood', 'Dessert')"
+                }
             },
-        ),
-        Tool(
-            name="filter_by_area",
-            description="Find all meals from a specific cuisine/area with urls for picture of each recipe. After showing results, ask user if they want to: see any specific recipe.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "area": {
-                        "type": "string",
-                        "description": "Area/cuisine name (e.g., 'Italian', 'Canadian')"
-                    }
-                },
-                "required": ["area"]
+            "required": ["category"]
+        },
+    ),
+    Tool(
+        name="filter_by_area",
+        description="Find all meals from a specific cuisine/area with urls for picture of each recipe. After showing results, ask user if they want to: see any specific recipe.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "area": {
+                    "type": "string",
+                    "description": "Area/cuisine name (e.g., 'Italian', 'Canadian')"
+                }
             },
-        ),
-    ]
+            "required": ["area"]
+        },
+    ),
+]
+
+
+async def get_api_tool_definitions() -> list[Tool]:
+    """Return all API tool definitions."""
+    return _API_TOOLS
 
 
 # ============================================================================
 # TOOL HANDLERS
 # ============================================================================
 
-async def handle_api_tool(name: str, arguments: Any) -> list[TextContent]:
-    """Handle all API tool calls."""
+# Proactive "what next" suggestions appended to tool results
+_SUGGESTION_HEADER: Final[str] = "\n\n **What would you like to do?**\n"
+_SUGGEST_SEARCH: Final[str] = _SUGGESTION_HEADER + (
+    "- See any specific recipe?\n"
+    "- See all categories or areas?\n"
+    "- Search recipes by ingredient or specific letter (a-z)?"
+)
+_SUGGEST_LETTER: Final[str] = _SUGGESTION_HEADER + (
+    "- See any specific recipe?\n"
+    "- See all categories or areas?\n"
+    "- Search by ingredient or name?"
+)
+_SUGGEST_LOOKUP: Final[str] = _SUGGESTION_HEADER + (
+    "- Save this recipe as a PDF?\n"
+    "- Create a shopping list?\n"
+    "- See another recipe?"
+)
+_SUGGEST_RANDOM: Final[str] = _SUGGESTION_HEADER + (
+    "- Save this recipe as a PDF?\n"
+    "- Create a shopping list?\n"
+    "- See another random meal?\n"
+    "- See all categories or areas?\n"
+    "- Search by ingredient or specific letter (a-z)?"
+)
+_SUGGEST_CATEGORIES: Final[str] = _SUGGESTION_HEADER + "- See recipes in any specific category?"
+_SUGGEST_FILTER: Final[str] = _SUGGESTION_HEADER + (
+    "- See any specific recipe?\n"
+    "- Try another filter?"
+)
+
+
+# Result sets larger than this are rendered in a worker thread
+_RENDER_IN_THREAD_THRESHOLD = 10
+
+
+def _render_full_meals(meals: list[dict]) -> str:
+    """Render full details for each meal, separated by horizontal rules."""
+    return "\n---\n\n".join([format_full_meal(meal) for meal in meals])
+
+
+async def _search_meal_by_name(client: httpx.AsyncClient, arguments: Any) -> list[TextContent]:
+    """Tool 1: Search meal by name."""
+    meal_name = arguments.get("name", "")
+    data = await _get_json(client, "/search.php", {"s": meal_name})
+    
+    meals = data.get("meals")
+    if not meals:
+        return [TextContent(type="text", text=f"No meals found for '{meal_name}'")]
+    
+    # Rendering many full recipes is pure CPU work; keep it off the event loop
+    if len(meals) > _RENDER_IN_THREAD_THRESHOLD:
+        body = await asyncio.to_thread(_render_full_meals, meals)
+    else:
+        body = _render_full_meals(meals)
+    
+    parts = [
+        f"Found {len(meals)} meal(s) for '{meal_name}':\n\n",
+        body,
+        _SUGGEST_SEARCH,  # Proactive suggestions
+    ]
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def _list_meals_by_first_letter(client: httpx.AsyncClient, arguments: Any) -> list[TextContent]:
+    """Tool 2: List meals by first letter."""
+    letter = arguments.get("letter", "a").upper()
     
-    async with httpx.AsyncClient(timeout=30.0, verify=False) as client:
-        try:
-            # Tool 1: Search meal by name
-            if name == "search_meal_by_name":
-                meal_name = arguments.get("name", "")
-                response = await client.get(f"{API_BASE}/search.php", params={"s": meal_name})
-                response.raise_for_status()
-                data = response.json()
-                
-                meals = data.get("meals")
-                if not meals:
-                    return [TextContent(type="text", text=f"No meals found for '{meal_name}'")]
-                
-                result = f"Found {len(meals)} meal(s) for '{meal_name}':\n\n"
-                result += "\n---\n\n".join([format_full_meal(meal) for meal in meals])
-                
-                # Add proactive suggestions
-                result += f"\n\n **What would you like to do?**\n"
-                result += "- See any specific recipe?\n"
-                result += "- See all categories or areas?\n"
-                result += "- Search recipes by ingredient or specific letter (a-z)?"
-                
-                return [TextContent(type="text", text=result)]
-            
-            # Tool 2: List meals by first letter
-            elif name == "list_meals_by_first_letter":
-                letter = arguments.get("letter", "a").upper()
-                
-                # Validate letter input
-                if not letter.isalpha() or len(letter) != 1:
-                    return [TextContent(type="text", text=f"Invalid input. Please provide a single letter (A-Z).")]
-                
-                response = await client.get(f"{API_BASE}/search.php", params={"f": letter})
-                response.raise_for_status()
-                data = response.json()
-                
-                meals = data.get("meals")
-                if not meals:
-                    return [TextContent(type="text", text=f"No meals found starting with '{letter}'")]
-                
-                result = f"Found {len(meals)} meal(s) starting with '{letter}':\n\n"
-                result += "\n".join([format_meal_summary(meal) for meal in meals])
-                result += f"\n\n **What would you like to do?**\n"
-                result += "- See any specific recipe?\n"
-                result += "- See all categories or areas?\n"
-                result += "- Search by ingredient or name?"
-                
-                return [TextContent(type="text", text=result)]
-            
-            # Tool 3: Lookup meal by ID
-            elif name == "lookup_meal_by_id":
-                meal_id = arguments.get("meal_id", "")
-                
-                # Validate meal_id format
-                if not meal_id.isdigit():
-                    return [TextContent(type="text", text=f"Invalid meal ID. Please provide a numeric ID.")]
-                
-                response = await client.get(f"{API_BASE}/lookup.php", params={"i": meal_id})
-                response.raise_for_status()
-                data = response.json()
-                
-                meals = data.get("meals")
-                if not meals:
-                    return [TextContent(type="text", text=f"No meal found with ID '{meal_id}'")]
-                
-                result = format_full_meal(meals[0])
-                result += "\n\n **What would you like to do?**\n"
-                result += "- Save this recipe as a PDF?\n"
-                result += "- Create a shopping list?\n"
-                result += "- See another recipe?"
-                
-                return [TextContent(type="text", text=result)]
-            
-            # Tool 4: Get random meal
-            elif name == "get_random_meal":
-                response = await client.get(f"{API_BASE}/random.php")
-                response.raise_for_status()
-                data = response.json()
-                
-                meal = data.get("meals", [{}])[0]
-                result = "Here's a random meal:\n\n" + format_full_meal(meal)
-                result += "\n\n **What would you like to do?**\n"
-                result += "- Save this recipe as a PDF?\n"
-                result += "- Create a shopping list?\n"
-                result += "- See another random meal?\n"
-                result += "- See all categories or areas?\n"
-                result += "- Search by ingredient or specific letter (a-z)?"
-                
-                return [TextContent(type="text", text=result)]
-            
-            # Tool 5: List all categories
-            elif name == "list_all_categories":
-                response = await client.get(f"{API_BASE}/categories.php")
-                response.raise_for_status()
-                data = response.json()
-                
-                categories = data.get("categories", [])
-                result = f"Found {len(categories)} categories:\n\n"
-                result += "\n".join([format_category(cat) for cat in categories])
-                result += "\n\n **What would you like to do?**\n"
-                result += "- See recipes in any specific category?"
-                
-                return [TextContent(type="text", text=result)]
-            
-            # Tool 6: List category names
-            elif name == "list_category_names":
-                response = await client.get(f"{API_BASE}/list.php", params={"c": "list"})
-                response.raise_for_status()
-                data = response.json()
-                
-                categories = data.get("meals", [])
-                names = [cat.get("strCategory", "") for cat in categories]
-                result = f"Available categories ({len(names)}):\n\n"
-                result += ", ".join(names)
-                
-                return [TextContent(type="text", text=result)]
-            
-            # Tool 7: List area names
-            elif name == "list_area_names":
-                response = await client.get(f"{API_BASE}/list.php", params={"a": "list"})
-                response.raise_for_status()
-                data = response.json()
-                
-                areas = data.get("meals", [])
-                names = [area.get("strArea", "") for area in areas]
-                result = f"Available cuisines/areas ({len(names)}):\n\n"
-                result += ", ".join(sorted(names))
-                
-                return [TextContent(type="text", text=result)]
-            
-            # Tool 8: List all ingredients
-            elif name == "list_all_ingredients":
-                response = await client.get(f"{API_BASE}/list.php", params={"i": "list"})
-                response.raise_for_status()
-                data = response.json()
-                
-                ingredients = data.get("meals", [])
-                result = f"Found {len(ingredients)} ingredients:\n\n"
-                
-                for ing in ingredients[:100]:
-                    name = ing.get("strIngredient", "Unknown")
-                    desc = ing.get("strDescription", "")
-                    if desc:
-                        desc = desc[:100] + "..." if len(desc) > 100 else desc
-                        result += f"- **{name}** - {desc}\n"
-                    else:
-                        result += f"- **{name}**\n"
-                
-                if len(ingredients) > 100:
-                    result += f"\n... and {len(ingredients) - 100} more ingredients (showing first 100)"
-                
-                return [TextContent(type="text", text=result)]
-            
-            # Tool 9: Filter by ingredient
-            elif name == "filter_by_ingredient":
-                ingredient = arguments.get("ingredient", "")
-                response = await client.get(f"{API_BASE}/filter.php", params={"i": ingredient})
-                response.raise_for_status()
-                data = response.json()
-                
-                meals = data.get("meals")
-                if not meals:
-                    return [TextContent(type="text", text=f"No meals found with ingredient '{ingredient}'")]
-                
-                result = f"Found {len(meals)} meal(s) with '{ingredient}':\n\n"
-                result += "\n".join([format_meal_summary(meal) for meal in meals])
-                
-                result += "\n\n **What would you like to do?**\n"
-                result += "- See any specific recipe?\n"
-                result += "- Try another filter?"
-                
-                return [TextContent(type="text", text=result)]
-            
-            # Tool 10: Filter by category
-            elif name == "filter_by_category":
-                category = arguments.get("category", "")
-                response = await client.get(f"{API_BASE}/filter.php", params={"c": category})
-                response.raise_for_status()
-                data = response.json()
-                
-                meals = data.get("meals")
-                if not meals:
-                    return [TextContent(type="text", text=f"No meals found in category '{category}'")]
-                
-                result = f"Found {len(meals)} meal(s) in category '{category}':\n\n"
-                result += "\n".join([format_meal_summary(meal) for meal in meals])
-                
-                result += "\n\n **What would you like to do?**\n"
-                result += "- See any specific recipe?\n"
-                result += "- Try another filter?"
-                
-                return [TextContent(type="text", text=result)]
-            
-            # Tool 11: Filter by area
-            elif name == "filter_by_area":
-                area = arguments.get("area", "")
-                response = await client.get(f"{API_BASE}/filter.php", params={"a": area})
-                response.raise_for_status()
-                data = response.json()
-                
-                meals = data.get("meals")
-                if not meals:
-                    return [TextContent(type="text", text=f"No meals found from area '{area}'")]
-                
-                result = f"Found {len(meals)} meal(s) from '{area}' cuisine:\n\n"
-                result += "\n".join([format_meal_summary(meal) for meal in meals])
-                
-                result += "\n\n **What would you like to do?**\n"
-                result += "- See any specific recipe?\n"
-                result += "- Try another filter?"
-                
-                return [TextContent(type="text", text=result)]
-            
-            else:
-                return None  # Not an API tool
-        
-        except httpx.TimeoutException:
+    # Validate letter input
+    if not letter.isalpha() or len(letter) != 1:
+        return [TextContent(type="text", text=f"Invalid input. Please provide a single letter (A-Z).")]
+    
+    data = await _get_json(client, "/search.php", {"f": letter})
+    
+    meals = data.get("meals")
+    if not meals:
+        return [TextContent(type="text", text=f"No meals found starting with '{letter}'")]
+    
+    parts = [
+        f"Found {len(meals)} meal(s) starting with '{letter}':\n\n",
+        "\n".join([format_meal_summary(meal) for meal in meals]),
+        _SUGGEST_LETTER,
+    ]
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def _lookup_meal_by_id(client: httpx.AsyncClient, arguments: Any) -> list[TextContent]:
+    """Tool 3: Lookup meal by ID."""
+    meal_id = arguments.get("meal_id", "")
+    
+    # Validate meal_id format
+    if not meal_id.isdigit():
+        return [TextContent(type="text", text=f"Invalid meal ID. Please provide a numeric ID.")]
+    
+    data = await _get_json(client, "/lookup.php", {"i": meal_id})
+    
+    meals = data.get("meals")
+    if not meals:
+        return [TextContent(type="text", text=f"No meal found with ID '{meal_id}'")]
+    
+    parts = [format_full_meal(meals[0]), _SUGGEST_LOOKUP]
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def _get_random_meal(client: httpx.AsyncClient, arguments: Any) -> list[TextContent]:
+    """Tool 4: Get random meal."""
+    data = await _get_json(client, "/random.php", ttl=0)
+    
+    meal = data.get("meals", [{}])[0]
+    parts = ["Here's a random meal:\n\n", format_full_meal(meal), _SUGGEST_RANDOM]
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def _list_all_categories(client: httpx.AsyncClient, arguments: Any) -> list[TextContent]:
+    """Tool 5: List all categories."""
+    data = await _get_json(client, "/categories.php", ttl=_CACHE_LONG_TTL)
+    
+    categories = data.get("categories", [])
+    parts = [
+        f"Found {len(categories)} categories:\n\n",
+        "\n".join([format_category(cat) for cat in categories]),
+        _SUGGEST_CATEGORIES,
+    ]
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def _list_category_names(client: httpx.AsyncClient, arguments: Any) -> list[TextContent]:
+    """Tool 6: List category names."""
+    data = await _get_json(client, "/list.php", {"c": "list"}, ttl=_CACHE_LONG_TTL)
+    
+    categories = data.get("meals", [])
+    names = [cat.get("strCategory", "") for cat in categories]
+    parts = [f"Available categories ({len(names)}):\n\n", ", ".join(names)]
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def _list_area_names(client: httpx.AsyncClient, arguments: Any) -> list[TextContent]:
+    """Tool 7: List area names."""
+    data = await _get_json(client, "/list.php", {"a": "list"}, ttl=_CACHE_LONG_TTL)
+    
+    areas = data.get("meals", [])
+    names = [area.get("strArea", "") for area in areas]
+    parts = [f"Available cuisines/areas ({len(names)}):\n\n", ", ".join(sorted(names))]
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def _list_all_ingredients(client: httpx.AsyncClient, arguments: Any) -> list[TextContent]:
+    """Tool 8: List all ingredients."""
+    data = await _get_json(client, "/list.php", {"i": "list"}, ttl=_CACHE_LONG_TTL)
+    
+    ingredients = data.get("meals", [])
+    parts = [f"Found {len(ingredients)} ingredients:\n\n"]
+    parts.extend([format_ingredient_line(ing) for ing in ingredients[:_MAX_INGREDIENTS]])
+    
+    if len(ingredients) > _MAX_INGREDIENTS:
+        parts.append(
+            f"\n... and {len(ingredients) - _MAX_INGREDIENTS} more ingredients "
+            f"(showing first {_MAX_INGREDIENTS})"
+        )
+    
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def _filter_by_ingredient(client: httpx.AsyncClient, arguments: Any) -> list[TextContent]:
+    """Tool 9: Filter by ingredient."""
+    ingredient = arguments.get("ingredient", "")
+    data = await _get_json(client, "/filter.php", {"i": ingredient})
+    
+    meals = data.get("meals")
+    if not meals:
+        return [TextContent(type="text", text=f"No meals found with ingredient '{ingredient}'")]
+    
+    parts = [
+        f"Found {len(meals)} meal(s) with '{ingredient}':\n\n",
+        "\n".join([format_meal_summary(meal) for meal in meals]),
+        _SUGGEST_FILTER,
+    ]
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def _filter_by_category(client: httpx.AsyncClient, arguments: Any) -> list[TextContent]:
+    """Tool 10: Filter by category."""
+    category = arguments.get("category", "")
+    data = await _get_json(client, "/filter.php", {"c": category})
+    
+    meals = data.get("meals")
+    if not meals:
+        return [TextContent(type="text", text=f"No meals found in category '{category}'")]
+    
+    parts = [
+        f"Found {len(meals)} meal(s) in category '{category}':\n\n",
+        "\n".join([format_meal_summary(meal) for meal in meals]),
+        _SUGGEST_FILTER,
+    ]
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def _filter_by_area(client: httpx.AsyncClient, arguments: Any) -> list[TextContent]:
+    """Tool 11: Filter by area."""
+    area = arguments.get("area", "")
+    data = await _get_json(client, "/filter.php", {"a": area})
+    
+    meals = data.get("meals")
+    if not meals:
+        return [TextContent(type="text", text=f"No meals found from area '{area}'")]
+    
+    parts = [
+        f"Found {len(meals)} meal(s) from '{area}' cuisine:\n\n",
+        "\n".join([format_meal_summary(meal) for meal in meals]),
+        _SUGGEST_FILTER,
+    ]
+    return [TextContent(type="text", text="".join(parts))]
+
+
+# Tool name -> handler coroutine
+_HANDLERS: dict[str, Callable[[httpx.AsyncClient, Any], Awaitable[list[TextContent]]]] = {
+    "search_meal_by_name": _search_meal_by_name,
+    "list_meals_by_first_letter": _list_meals_by_first_letter,
+    "lookup_meal_by_id": _lookup_meal_by_id,
+    "get_random_meal": _get_random_meal,
+    "list_all_categories": _list_all_categories,
+    "list_category_names": _list_category_names,
+    "list_area_names": _list_area_names,
+    "list_all_ingredients": _list_all_ingredients,
+    "filter_by_ingredient": _filter_by_ingredient,
+    "filter_by_category": _filter_by_category,
+    "filter_by_area": _filter_by_area,
+}
+
+
+async def _safe(call: Callable[[], Awaitable[list[TextContent]]]) -> list[TextContent]:
+    """
+    Await a tool call, turning API and data errors into user-facing messages.
+    
+    asyncio.CancelledError is a BaseException and is deliberately not caught,
+    so a client disconnect still cancels the in-flight request.
+    """
+    try:
+        return await call()
+    except httpx.TimeoutException:
+        return [TextContent(
+            type="text",
+            text="Request timed out while connecting to TheMealDB. Please check your internet connection and try again."
+        )]
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
             return [TextContent(
                 type="text",
-                text="Request timed out while connecting to TheMealDB. Please check your internet connection and try again."
+                text="Resource not found on TheMealDB API. The recipe or data you requested may not exist."
             )]
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                return [TextContent(
-                    type="text",
-                    text="Resource not found on TheMealDB API. The recipe or data you requested may not exist."
-                )]
-            elif e.response.status_code >= 500:
-                return [TextContent(
-                    type="text",
-                    text=f"TheMealDB server error ({e.response.status_code}). The service may be temporarily unavailable. Please try again later."
-                )]
-            else:
-                return [TextContent(
-                    type="text",
-                    text=f"HTTP error ({e.response.status_code}) from TheMealDB: {str(e)}"
-                )]
-        except httpx.RequestError as e:
+        elif e.response.status_code >= 500:
             return [TextContent(
                 type="text",
-                text=f"Network error while connecting to TheMealDB: {str(e)}. Please check your internet connection."
+                text=f"TheMealDB server error ({e.response.status_code}). The service may be temporarily unavailable. Please try again later."
             )]
-        except (KeyError, ValueError, TypeError) as e:
+        else:
             return [TextContent(
                 type="text",
-                text=f"Error processing API response from TheMealDB. The data format may have changed: {str(e)}"
+                text=f"HTTP error ({e.response.status_code}) from TheMealDB: {str(e)}"
             )]
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Unexpected error: {str(e)}"
-            )]
\ No newline at end of file
+    except httpx.RequestError as e:
+        return [TextContent(
+            type="text",
+            text=f"Network error while connecting to TheMealDB: {str(e)}. Please check your internet connection."
+        )]
+    except (KeyError, ValueError, TypeError) as e:
+        return [TextContent(
+            type="text",
+            text=f"Error processing API response from TheMealDB. The data format may have changed: {str(e)}"
+        )]
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=f"Unexpected error: {str(e)}"
+        )]
+
+
+async def handle_api_tool(name: str, arguments: Any) -> list[TextContent]:
+    """Handle all API tool calls."""
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return None  # Not an API tool
+    
+    return await _safe(lambda: handler(_get_client(), arguments))
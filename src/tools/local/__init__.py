@@ -6,9 +6,15 @@ and managing local recipe files.
 """
 
 from .tools import get_local_tool_definitions, handle_local_tool
-from .config import RECIPES_DIR, load_recipes_dir, save_recipes_dir
+from .config import (
+    RECIPES_DIR,
+    load_recipes_dir,
+    save_recipes_dir,
+    save_recipes_dir_async,
+)
 from .categories import get_ingredient_category
 from .api import fetch_meal_data
+from ._http import close_local_client
 from .pdf_recipe import create_recipe_pdf
 from .pdf_shopping import create_shopping_list_pdf
 
@@ -22,10 +28,12 @@ __all__ = [
     'RECIPES_DIR',
     'load_recipes_dir',
     'save_recipes_dir',
+    'save_recipes_dir_async',
     
     # Utilities
     'get_ingredient_category',
     'fetch_meal_data',
+    'close_local_client',
     
     # PDF generators
     'create_recipe_pdf',
@@ -0,0 +1,58 @@
+"""
+Shared HTTP client for local tools.
+Used for both TheMealDB lookups and recipe image downloads.
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+
+# Ask for compressed bodies explicitly; httpx decodes them transparently
+_HEADERS = {"Accept-Encoding": "gzip, deflate", "User-Agent": "mealdb-mcp/1.0"}
+
+# One client for every local tool call, created on first use so lookups and
+# image downloads share a connection pool (and TLS sessions) over HTTP/2
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared local tools client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            headers=_HEADERS,
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=1,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            ),
+        )
+    return _client
+
+
+# Cap on in-flight meal lookups. HTTP/2 multiplexes every request over one
+# connection, so the pool limits above don't bound a large shopping list.
+# Created on first use and dropped by close_local_client(), since a semaphore
+# binds to the event loop that first waits on it.
+_MAX_CONCURRENT_REQUESTS = 8
+_request_slots: Optional[asyncio.Semaphore] = None
+
+
+def get_request_slots() -> asyncio.Semaphore:
+    """Return the shared meal lookup semaphore, creating it on first use."""
+    global _request_slots
+    if _request_slots is None:
+        _request_slots = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+    return _request_slots
+
+
+async def close_local_client() -> None:
+    """Close the shared local tools client (called on server shutdown)."""
+    global _client, _request_slots
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    _request_slots = None
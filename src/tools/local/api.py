@@ -3,31 +3,51 @@ API client for TheMealDB.
 Handles fetching meal data from the external API.
 """
 
-import httpx
+import time
+
+import orjson
+
+from ._http import get_client, get_request_slots
+
+
+API_BASE = "https://www.themealdb.com/api/json/v1/1"
+
+# Recently fetched meals: meal_id -> (expires_at, meal). Saving a recipe PDF
+# and then a shopping list for the same meal only hits the API once.
+_MEAL_CACHE_TTL = 3600
+_MEAL_CACHE_MAXSIZE = 256
+_meal_cache: dict[str, tuple[float, dict]] = {}
 
 
 async def fetch_meal_data(meal_id: str) -> dict:
     """
     Fetch meal data from TheMealDB API.
-    
+
     Args:
         meal_id: The meal ID to fetch
-        
+
     Returns:
         Dictionary containing meal data
-        
+
     Raises:
         ValueError: If meal ID is not found
         httpx.HTTPError: If API request fails
     """
-    async with httpx.AsyncClient(timeout=30.0, verify=False) as client:
-        response = await client.get(
-            f"https://www.themealdb.com/api/json/v1/1/lookup.php",
-            params={"i": meal_id}
-        )
-        response.raise_for_status()
-        data = response.json()
-        meals = data.get("meals")
-        if not meals:
-            raise ValueError(f"Meal ID {meal_id} not found")
-        return meals[0]
\ No newline at end of file
+    entry = _meal_cache.get(meal_id)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    
+    client = get_client()
+    async with get_request_slots():
+        response = await client.get(f"{API_BASE}/lookup.php", params={"i": meal_id})
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+    meals = data.get("meals")
+    if not meals:
+        raise ValueError(f"Meal ID {meal_id} not found")
+    
+    if meal_id not in _meal_cache and len(_meal_cache) >= _MEAL_CACHE_MAXSIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        del _meal_cache[next(iter(_meal_cache))]
+    _meal_cache[meal_id] = (time.monotonic() + _MEAL_CACHE_TTL, meals[0])
+    return meals[0]
@@ -3,14 +3,19 @@ Ingredient categorization for shopping lists.
 Maps ingredients to grocery store categories.
 """
 
+import functools
+
 
 INGREDIENT_CATEGORIES = {
-    # Produce
+    # Produce. Single-word keys match in table order, so 'pepper', 'bean' and
+    # 'salt' (below) keep the slots they have always been checked in, even
+    # though they belong to other categories ('bean' before 'butter', etc.)
     'tomato': 'Produce', 'lettuce': 'Produce', 'onion': 'Produce', 'garlic': 'Produce',
     'carrot': 'Produce', 'potato': 'Produce', 'broccoli': 'Produce', 'spinach': 'Produce',
-    'pepper': 'Produce', 'cucumber': 'Produce', 'mushroom': 'Produce', 'apple': 'Produce',
-    'banana': 'Produce', 'lemon': 'Produce', 'lime': 'Produce', 'orange': 'Produce',
-    'celery': 'Produce', 'zucchini': 'Produce', 'pumpkin': 'Produce', 'bean': 'Produce',
+    'bell pepper': 'Produce', 'pepper': 'Spices', 'cucumber': 'Produce', 'mushroom': 'Produce',
+    'apple': 'Produce', 'banana': 'Produce', 'lemon': 'Produce', 'lime': 'Produce',
+    'orange': 'Produce', 'celery': 'Produce', 'zucchini': 'Produce', 'pumpkin': 'Produce',
+    'green bean': 'Produce', 'bean': 'Pantry & Dry',
     
     # Meat & Seafood
     'chicken': 'Meat & Seafood', 'beef': 'Meat & Seafood', 'pork': 'Meat & Seafood',
@@ -25,18 +30,23 @@ INGREDIENT_CATEGORIES = {
     
     # Pantry & Dry Goods
     'flour': 'Pantry & Dry', 'rice': 'Pantry & Dry', 'pasta': 'Pantry & Dry',
-    'bread': 'Pantry & Dry', 'sugar': 'Pantry & Dry', 'salt': 'Pantry & Dry',
+    'bread': 'Pantry & Dry', 'sugar': 'Pantry & Dry', 'salt': 'Spices',
     'oil': 'Pantry & Dry', 'vinegar': 'Pantry & Dry', 'sauce': 'Pantry & Dry',
     'honey': 'Pantry & Dry', 'jam': 'Pantry & Dry', 'cereal': 'Pantry & Dry',
-    'bean': 'Pantry & Dry', 'lentil': 'Pantry & Dry',
+    'lentil': 'Pantry & Dry', 'fish sauce': 'Pantry & Dry',
     
     # Spices & Seasonings
-    'salt': 'Spices', 'pepper': 'Spices', 'paprika': 'Spices', 'cumin': 'Spices',
+    'paprika': 'Spices', 'cumin': 'Spices',
     'cinnamon': 'Spices', 'ginger': 'Spices', 'turmeric': 'Spices', 'basil': 'Spices',
     'oregano': 'Spices', 'thyme': 'Spices', 'chili': 'Spices', 'mustard': 'Spices',
 }
 
 
+# Multi-word keys first, so 'bell pepper' wins over 'pepper'; everything
+# else keeps table order
+_CATEGORY_PAIRS = tuple(sorted(INGREDIENT_CATEGORIES.items(), key=lambda kv: ' ' not in kv[0]))
+
+
 def get_ingredient_category(ingredient: str) -> str:
     """
     Determine the category of an ingredient.
@@ -47,11 +57,16 @@ def get_ingredient_category(ingredient: str) -> str:
     Returns:
         Category name (e.g., 'Produce', 'Meat & Seafood', 'Other')
     """
-    ingredient_lower = ingredient.lower()
-    
-    # Check for exact or partial matches
-    for key, category in INGREDIENT_CATEGORIES.items():
+    # Normalize before the cached lookup so 'Tomato' and 'TOMATO' share an entry
+    return _category_for(ingredient.lower())
+
+
+@functools.lru_cache(maxsize=4096)
+def _category_for(ingredient_lower: str) -> str:
+    """Match a lowercased ingredient name against the category keywords."""
+    # Check for exact or partial matches, most specific keyword first
+    for key, category in _CATEGORY_PAIRS:
         if key in ingredient_lower:
             return category
     
-    return 'Other'  # Default category
\ No newline at end of file
+    return 'Other'  # Default category
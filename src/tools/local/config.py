@@ -3,25 +3,39 @@ Configuration management for local tools.
 Handles recipes directory configuration and user preferences.
 """
 
+import asyncio
 import json
 from pathlib import Path
+from typing import Optional
 
 
 # Config file for storing user preferences
 CONFIG_FILE = Path.home() / ".mealdb_recipes_config"
 
+# Parsed config file, read once and kept in sync by save_recipes_dir
+_cached_config: Optional[dict] = None
+
+
+def _read_config() -> dict:
+    """Return the parsed config file, reading it from disk only once."""
+    global _cached_config
+    if _cached_config is None:
+        try:
+            config = json.loads(CONFIG_FILE.read_text())
+        except (OSError, ValueError):
+            config = None
+        _cached_config = config if isinstance(config, dict) else {}
+    return _cached_config
+
 
 def load_recipes_dir() -> Path:
     """Load recipes directory from config or return default."""
-    if CONFIG_FILE.exists():
+    recipes_path = _read_config().get("recipes_dir")
+    if recipes_path:
         try:
-            with open(CONFIG_FILE, 'r') as f:
-                config = json.load(f)
-                recipes_path = config.get("recipes_dir")
-                if recipes_path:
-                    path = Path(recipes_path).expanduser()
-                    path.mkdir(parents=True, exist_ok=True)
-                    return path
+            path = Path(recipes_path).expanduser()
+            path.mkdir(parents=True, exist_ok=True)
+            return path
         except Exception:
             pass
     
@@ -40,15 +54,25 @@ def load_recipes_dir() -> Path:
 
 def save_recipes_dir(directory: str) -> Path:
     """Save recipes directory to config."""
+    global _cached_config
     path = Path(directory).expanduser()
     path.mkdir(parents=True, exist_ok=True)
     
     config = {"recipes_dir": str(path)}
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    
+    # Write to a temp file and rename so a crash can't leave a truncated config
+    tmp_file = CONFIG_FILE.with_suffix(".tmp")
+    tmp_file.write_text(json.dumps(config, indent=2))
+    tmp_file.replace(CONFIG_FILE)
+    _cached_config = config
     
     return path
 
 
+async def save_recipes_dir_async(directory: str) -> Path:
+    """Run save_recipes_dir in a worker thread to keep the event loop free."""
+    return await asyncio.to_thread(save_recipes_dir, directory)
+
+
 # Initialize recipes directory
-RECIPES_DIR = load_recipes_dir()
\ No newline at end of file
+RECIPES_DIR = load_recipes_dir()
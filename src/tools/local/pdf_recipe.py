@@ -3,11 +3,15 @@ Recipe PDF generation.
 Creates professional, printable PDF recipes with images.
 """
 
+import asyncio
 import os
+import stat
 import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
 from io import BytesIO
+from typing import Optional
 
 import httpx
 from PIL import Image as PILImage
@@ -17,6 +21,165 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
 from reportlab.lib import colors
 
+from ._http import get_client
+
+
+# TheMealDB stores up to 20 ingredient/measure pairs as numbered fields
+_INGREDIENT_KEYS = tuple((f"strIngredient{i}", f"strMeasure{i}") for i in range(1, 21))
+
+# Styles are immutable once built, so create them once per process
+_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=28,
+    textColor=colors.HexColor('#2C3E50'),
+    spaceAfter=12,
+    alignment=1,  # Center
+    fontName='Helvetica-Bold'
+)
+
+_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=14,
+    textColor=colors.HexColor('#34495E'),
+    spaceAfter=10,
+    spaceBefore=10,
+    fontName='Helvetica-Bold'
+)
+
+_NORMAL_STYLE = ParagraphStyle(
+    'CustomNormal',
+    parent=_STYLES['Normal'],
+    fontSize=10,
+    leading=14,
+    textColor=colors.HexColor('#2C3E50')
+)
+
+_FOOTER_STYLE = ParagraphStyle(
+    'Footer',
+    parent=_STYLES['Normal'],
+    fontSize=8,
+    textColor=colors.HexColor('#95A5A6'),
+    alignment=1
+)
+
+_INFO_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ECF0F1')),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#BDC3C7')),
+])
+
+_INGREDIENT_TABLE_STYLE = TableStyle([
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
+    ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#ECF0F1')),
+])
+
+# On-disk cache of resized recipe thumbnails, keyed by meal ID, so
+# regenerating a recipe PDF skips the download, decode and resize. It lives
+# in the user's own cache directory; a shared /tmp path would let another
+# local user plant thumbnails or symlinks in it
+_THUMB_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "mealdb_thumbs"
+_THUMB_CACHE_MAX_AGE = 30 * 24 * 3600  # 30 days
+_THUMB_CACHE_MAX_ENTRIES = 200
+
+
+def _thumbnail_cache_path(meal_id: Optional[str]) -> Optional[Path]:
+    """Return the cache file for a meal's thumbnail, or None if uncacheable."""
+    if not meal_id or not str(meal_id).isdigit():
+        return None
+    return _THUMB_CACHE_DIR / f"{meal_id}.jpg"
+
+
+def _check_cache_dir(create: bool = False) -> None:
+    """
+    Make sure the thumbnail cache directory is a private directory of ours.
+    
+    Raises:
+        OSError: If it is missing (and create is False), a symlink, not a
+            directory, or owned by another user
+    """
+    if create:
+        _THUMB_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    st = os.lstat(_THUMB_CACHE_DIR)
+    if not stat.S_ISDIR(st.st_mode):
+        raise OSError(f"Thumbnail cache {_THUMB_CACHE_DIR} is a symlink or not a directory")
+    if hasattr(os, 'getuid') and st.st_uid != os.getuid():
+        raise OSError(f"Thumbnail cache {_THUMB_CACHE_DIR} is owned by another user")
+
+
+def _load_cached_thumbnail(cache_path: Optional[Path]) -> Optional[bytes]:
+    """Return a cached thumbnail's bytes if present and not stale."""
+    if cache_path is None:
+        return None
+    try:
+        _check_cache_dir()
+        if time.time() - cache_path.stat().st_mtime < _THUMB_CACHE_MAX_AGE:
+            return cache_path.read_bytes()
+    except OSError:
+        pass
+    return None
+
+
+def _store_thumbnail(cache_path: Optional[Path], data: bytes) -> None:
+    """Write a resized thumbnail to the cache, evicting the oldest entries."""
+    if cache_path is None:
+        return
+    try:
+        _check_cache_dir(create=True)
+        # Unpredictable temp name created with O_EXCL, then renamed into place
+        with tempfile.NamedTemporaryFile(dir=_THUMB_CACHE_DIR, suffix='.tmp', delete=False) as tmp:
+            tmp.write(data)
+        try:
+            os.replace(tmp.name, cache_path)
+        except OSError:
+            os.unlink(tmp.name)
+            raise
+        
+        entries = [entry for entry in os.scandir(_THUMB_CACHE_DIR) if entry.name.endswith('.jpg')]
+        if len(entries) > _THUMB_CACHE_MAX_ENTRIES:
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in entries[:-_THUMB_CACHE_MAX_ENTRIES]:
+                os.unlink(entry.path)
+    except OSError:
+        # Caching is best-effort; the PDF still gets the image
+        pass
+
+
+def _decode_and_resize(img_data: BytesIO, max_width: int) -> bytes:
+    """Decode a downloaded image and return it as a JPEG at most max_width wide."""
+    img = PILImage.open(img_data)
+    
+    # Downscale only; reportlab stretches smaller images to the
+    # same 4" box, and bilinear is indistinguishable at print size
+    if img.width > max_width:
+        new_height = img.height * max_width // img.width
+        
+        # Let libjpeg decode large JPEGs at a reduced scale (no-op for
+        # other formats); the draft is never smaller than the target
+        img.draft('RGB', (max_width, new_height))
+        img = img.resize((max_width, new_height), PILImage.Resampling.BILINEAR)
+    
+    # JPEG needs RGB; TheMealDB thumbnails already are, so skip the copy
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    
+    img_buffer = BytesIO()
+    img.save(img_buffer, format='JPEG', quality=85)
+    return img_buffer.getvalue()
+
 
 async def create_recipe_pdf(meal: dict, filepath: Path) -> None:
     """
@@ -36,39 +199,9 @@ async def create_recipe_pdf(meal: dict, filepath: Path) -> None:
     )
     
     story = []
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=28,
-        textColor=colors.HexColor('#2C3E50'),
-        spaceAfter=12,
-        alignment=1,  # Center
-        fontName='Helvetica-Bold'
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#34495E'),
-        spaceAfter=10,
-        spaceBefore=10,
-        fontName='Helvetica-Bold'
-    )
-    
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        leading=14,
-        textColor=colors.HexColor('#2C3E50')
-    )
     
     # Recipe title
-    title = Paragraph(meal.get('strMeal', 'Unknown Recipe'), title_style)
+    title = Paragraph(meal.get('strMeal', 'Unknown Recipe'), _TITLE_STYLE)
     story.append(title)
     
     # Recipe info
@@ -79,50 +212,51 @@ async def create_recipe_pdf(meal: dict, filepath: Path) -> None:
     ]
     
     info_table = Table(info_data, colWidths=[1.2*inch, 4.3*inch])
-    info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ECF0F1')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#BDC3C7')),
-    ]))
+    info_table.setStyle(_INFO_TABLE_STYLE)
     
     story.append(info_table)
     story.append(Spacer(1, 0.3*inch))
     
     # Try to add recipe image using async httpx
     image_url = meal.get('strMealThumb')
-    temp_img_path = None
     if image_url:
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(image_url)
-                response.raise_for_status()
-                
-                img_data = BytesIO(response.content)
-                img = PILImage.open(img_data)
-                
-                # Resize image for PDF (max 4 inches wide)
-                max_width = 4 * inch
-                width_ratio = max_width / img.width
-                new_height = img.height * width_ratio
-                
-                # Save resized image to temporary file
-                resized_img = img.resize((int(max_width), int(new_height)), PILImage.Resampling.LANCZOS)
-                
-                # Create temporary file for the image
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
-                    temp_img_path = tmp_file.name
-                    resized_img.save(temp_img_path, format='JPEG', quality=95)
-                
-                # Add image to PDF
-                pdf_img = Image(temp_img_path, width=max_width, height=new_height)
-                story.append(pdf_img)
-                story.append(Spacer(1, 0.2*inch))
+            max_width = 4 * inch
+            cache_path = _thumbnail_cache_path(meal.get('idMeal'))
+            # Cache reads and writes touch the disk, so keep them off the event loop
+            cached = None
+            if cache_path is not None:
+                cached = await asyncio.to_thread(_load_cached_thumbnail, cache_path)
+            
+            if cached is not None:
+                img_buffer = BytesIO(cached)
+            else:
+                # Stream the download into one buffer rather than holding the
+                # response body and a BytesIO copy of it at the same time
+                img_data = BytesIO()
+                async with get_client().stream("GET", image_url) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes(65536):
+                        img_data.write(chunk)
+                img_data.seek(0)
                 
+                # Decode, resize and re-encode in a worker thread; Pillow
+                # releases the GIL, so concurrent PDFs resize in parallel
+                jpeg_bytes = await asyncio.to_thread(_decode_and_resize, img_data, int(max_width))
+                if cache_path is not None:
+                    await asyncio.to_thread(_store_thumbnail, cache_path, jpeg_bytes)
+                img_buffer = BytesIO(jpeg_bytes)
+            
+            # Scale to the 4" width, keeping the aspect ratio
+            img_width, img_height = PILImage.open(img_buffer).size
+            new_height = img_height * max_width / img_width
+            img_buffer.seek(0)
+            
+            # Add image to PDF
+            pdf_img = Image(img_buffer, width=max_width, height=new_height)
+            story.append(pdf_img)
+            story.append(Spacer(1, 0.2*inch))
+            
         except httpx.TimeoutException:
             # Image download timed out, continue without image
             pass
@@ -140,58 +274,35 @@ async def create_recipe_pdf(meal: dict, filepath: Path) -> None:
             pass
     
     # Ingredients section
-    story.append(Paragraph("INGREDIENTS", heading_style))
-    
-    ingredients = []
-    for i in range(1, 21):
-        ingredient = meal.get(f"strIngredient{i}", "")
-        measure = meal.get(f"strMeasure{i}", "")
-        if ingredient and ingredient.strip():
-            ingredients.append([
-                f"{measure.strip()}",
-                ingredient.strip()
-            ])
+    story.append(Paragraph("INGREDIENTS", _HEADING_STYLE))
+    
+    get = meal.get
+    ingredients = [
+        ((get(meas_key) or "").strip(), ingredient)
+        for ing_key, meas_key in _INGREDIENT_KEYS
+        if (ingredient := (get(ing_key) or "").strip())
+    ]
     
     if ingredients:
         ing_table = Table(ingredients, colWidths=[1.5*inch, 4*inch])
-        ing_table.setStyle(TableStyle([
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
-            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#ECF0F1')),
-        ]))
+        ing_table.setStyle(_INGREDIENT_TABLE_STYLE)
         story.append(ing_table)
     else:
-        story.append(Paragraph("No ingredients listed", normal_style))
+        story.append(Paragraph("No ingredients listed", _NORMAL_STYLE))
     
     story.append(Spacer(1, 0.2*inch))
     
     # Instructions section
-    story.append(Paragraph("INSTRUCTIONS", heading_style))
+    story.append(Paragraph("INSTRUCTIONS", _HEADING_STYLE))
     instructions = meal.get('strInstructions', 'No instructions available')
-    story.append(Paragraph(instructions, normal_style))
+    story.append(Paragraph(instructions, _NORMAL_STYLE))
     
     story.append(Spacer(1, 0.3*inch))
     
     # Footer
     footer_text = f"Generated on {datetime.now().strftime('%B %d, %Y at %H:%M')}"
-    story.append(Paragraph(footer_text, ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.HexColor('#95A5A6'),
-        alignment=1
-    )))
-    
-    # Build PDF
-    doc.build(story)
-    
-    # Clean up temporary image file if it was created
-    if temp_img_path and os.path.exists(temp_img_path):
-        try:
-            os.unlink(temp_img_path)
-        except Exception:
-            pass
+    story.append(Paragraph(footer_text, _FOOTER_STYLE))
+    
+    # Build PDF in a worker thread; layout and compression are CPU-bound
+    # and would otherwise stall every other tool call on the event loop
+    await asyncio.to_thread(doc.build, story)
@@ -3,6 +3,8 @@ Shopping list PDF generation.
 Creates professional, printable shopping list PDFs organized by category.
 """
 
+import itertools
+import operator
 from datetime import datetime
 from pathlib import Path
 
@@ -15,6 +17,70 @@ from reportlab.lib import colors
 from .categories import get_ingredient_category
 
 
+# Checkbox symbol (☐) printed in front of every ingredient
+_CHECKBOX = "\u2610  "
+
+# Styles are immutable once built, so create them once per process
+_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=28,
+    textColor=colors.HexColor('#27AE60'),
+    spaceAfter=12,
+    alignment=1,  # Center
+    fontName='Helvetica-Bold'
+)
+
+_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=16,
+    textColor=colors.HexColor('#2C3E50'),
+    spaceAfter=10,
+    spaceBefore=15,
+    fontName='Helvetica-Bold'
+)
+
+_RECIPES_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#E8F8F5')),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
+    ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#BDC3C7')),
+])
+
+_CATEGORY_TABLE_STYLE = TableStyle([
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (0, -1), 10),
+    ('FONTSIZE', (1, 0), (1, -1), 8),
+    ('TEXTCOLOR', (1, 0), (1, -1), colors.HexColor('#7F8C8D')),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('LINEBELOW', (0, 0), (-1, -1), 0.5, colors.HexColor('#ECF0F1')),
+])
+
+_SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F8F9F9')),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#BDC3C7')),
+])
+
+
 def create_shopping_list_pdf(meal_names: list, all_ingredients: dict, filepath: Path) -> None:
     """
     Create a professional, printable shopping list PDF.
@@ -35,122 +101,71 @@ def create_shopping_list_pdf(meal_names: list, all_ingredients: dict, filepath:
     )
     
     story = []
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=28,
-        textColor=colors.HexColor('#27AE60'),
-        spaceAfter=12,
-        alignment=1,  # Center
-        fontName='Helvetica-Bold'
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#2C3E50'),
-        spaceAfter=10,
-        spaceBefore=15,
-        fontName='Helvetica-Bold'
-    )
-    
-    subheading_style = ParagraphStyle(
-        'CustomSubHeading',
-        parent=styles['Heading3'],
-        fontSize=12,
-        textColor=colors.HexColor('#34495E'),
-        spaceAfter=8,
-        spaceBefore=10,
-        fontName='Helvetica-Bold'
-    )
     
     # Title
-    title = Paragraph("Shopping List", title_style)
+    title = Paragraph("Shopping List", _TITLE_STYLE)
     story.append(title)
     story.append(Spacer(1, 0.2*inch))
     
     # Recipes section
-    story.append(Paragraph("Recipes", heading_style))
+    story.append(Paragraph("Recipes", _HEADING_STYLE))
     
-    recipes_data = [[f"{i}.", name] for i, name in enumerate(meal_names, 1)]
+    recipes_data = [(f"{i}.", name) for i, name in enumerate(meal_names, 1)]
     
     if recipes_data:
         recipes_table = Table(recipes_data, colWidths=[0.4*inch, 6.1*inch])
-        recipes_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#E8F8F5')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
-            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#BDC3C7')),
-        ]))
+        recipes_table.setStyle(_RECIPES_TABLE_STYLE)
         story.append(recipes_table)
     
     story.append(Spacer(1, 0.3*inch))
     
     # Ingredients section
-    story.append(Paragraph("Ingredients", heading_style))
+    story.append(Paragraph("Ingredients", _HEADING_STYLE))
     story.append(Spacer(1, 0.1*inch))
     
-    # Sort ingredients alphabetically
-    sorted_ingredients = sorted(all_ingredients.items(), key=lambda x: x[1]['original'].lower())
-    
-    # Group by category
-    categorized = {}
-    for ing_key, ing_data in sorted_ingredients:
-        category = get_ingredient_category(ing_data['original'])
-        if category not in categorized:
-            categorized[category] = []
-        categorized[category].append((ing_key, ing_data))
+    # Sort once by (category, name) and walk the groups in order
+    sorted_ingredients = sorted(
+        (get_ingredient_category(ing_data['original']), ing_data['original'].lower(), ing_key, ing_data)
+        for ing_key, ing_data in all_ingredients.items()
+    )
     
-    # Display ingredients by category
-    for category in sorted(categorized.keys()):
+    # Lay out every category in one table, with each category as a spanned
+    # header row, so reportlab wraps and splits a single flowable
+    rows = []
+    header_cmds = []
+    for category, group in itertools.groupby(sorted_ingredients, key=operator.itemgetter(0)):
         # Category heading
-        story.append(Paragraph(category, subheading_style))
+        rows.append((category, ""))
+        hdr = len(rows) - 1
+        header_cmds.extend([
+            ('SPAN', (0, hdr), (-1, hdr)),
+            ('BACKGROUND', (0, hdr), (-1, hdr), colors.HexColor('#ECF0F1')),
+            ('TEXTCOLOR', (0, hdr), (-1, hdr), colors.HexColor('#34495E')),
+            ('FONTNAME', (0, hdr), (-1, hdr), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, hdr), (-1, hdr), 12),
+            ('TOPPADDING', (0, hdr), (-1, hdr), 8),
+        ])
         
-        # Build ingredient table for this category
-        ing_rows = []
-        for ing_key, ing_data in categorized[category]:
-            # Checkbox symbol (☐)
-            checkbox = "☐"
+        # Ingredient rows for this category
+        for _, _, ing_key, ing_data in group:
+            name = ing_data['original'].title()
+            measures = ing_data['measures']
             
             # Format ingredient name and measure
-            if ing_data['measures']:
-                measure_str = ', '.join(ing_data['measures'])
-                ingredient_text = f"{checkbox}  {ing_data['original'].title()} ({measure_str})"
+            if measures:
+                ingredient_text = f"{_CHECKBOX}{name} ({', '.join(measures)})"
             else:
-                ingredient_text = f"{checkbox}  {ing_data['original'].title()}"
+                ingredient_text = _CHECKBOX + name
             
-            # Recipe reference
-            recipe_str = ', '.join(set(ing_data['recipes']))
+            # Recipe reference (deduplicated, in first-seen order)
+            recipe_str = ', '.join(dict.fromkeys(ing_data['recipes']))
             
-            ing_rows.append([ingredient_text, f"for: {recipe_str}"])
-        
-        if ing_rows:
-            category_table = Table(ing_rows, colWidths=[3*inch, 3.5*inch])
-            category_table.setStyle(TableStyle([
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica'),
-                ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (0, -1), 10),
-                ('FONTSIZE', (1, 0), (1, -1), 8),
-                ('TEXTCOLOR', (1, 0), (1, -1), colors.HexColor('#7F8C8D')),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('LINEBELOW', (0, 0), (-1, -1), 0.5, colors.HexColor('#ECF0F1')),
-            ]))
-            story.append(category_table)
-        
-        story.append(Spacer(1, 0.15*inch))
+            rows.append((ingredient_text, "for: " + recipe_str))
+    
+    if rows:
+        ingredients_table = Table(rows, colWidths=[3*inch, 3.5*inch])
+        ingredients_table.setStyle(TableStyle(header_cmds, parent=_CATEGORY_TABLE_STYLE))
+        story.append(ingredients_table)
     
     # Summary
     story.append(Spacer(1, 0.2*inch))
@@ -161,16 +176,7 @@ def create_shopping_list_pdf(meal_names: list, all_ingredients: dict, filepath:
     ]
     
     summary_table = Table(summary_data, colWidths=[1.5*inch, 5*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F8F9F9')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#BDC3C7')),
-    ]))
+    summary_table.setStyle(_SUMMARY_TABLE_STYLE)
     story.append(summary_table)
     
     # Build PDF
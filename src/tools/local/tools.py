@@ -3,586 +3,750 @@ MCP tool definitions and handlers for local recipe management.
 Provides tools for saving recipes, creating shopping lists, and managing files.
 """
 
-from datetime import datetime
+import asyncio
+import os
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable, Optional
 
+import orjson
 from mcp.types import Tool, TextContent
 
-from .api import fetch_meal_data
+from ._http import get_client
+from .api import API_BASE, fetch_meal_data
 from . import config
 from .pdf_recipe import create_recipe_pdf
 from .pdf_shopping import create_shopping_list_pdf
 
 
-def get_local_tool_definitions() -> list[Tool]:
-    """Return all local tool definitions."""
-    return [
-        Tool(
-            name="save_recipe_to_file",
-            description="Save a recipe to a PDF file. Use this ONLY when user explicitly asks to save/download a recipe. For viewing recipes, use lookup_meal_by_id from API tools instead.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "meal_id": {
-                        "type": "string",
-                        "description": "Meal ID to save (e.g., '52772')"
-                    },
-                    "filename": {
-                        "type": "string",
-                        "description": "Optional custom filename (without extension). If not provided, uses meal name."
-                    },
-                    "directory": {
-                        "type": "string",
-                        "description": "Optional directory path where to save the file. If not provided, uses default recipes directory."
-                    }
+_LOCAL_TOOLS: list[Tool] = [
+    Tool(
+        name="save_recipe_to_file",
+        description="Save a recipe to a PDF file. Use this ONLY when user explicitly asks to save/download a recipe. For viewing recipes, use lookup_meal_by_id from API tools instead.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "meal_id": {
+                    "type": "string",
+                    "description": "Meal ID to save (e.g., '52772')"
                 },
-                "required": ["meal_id"]
-            },
-        ),
-        Tool(
-            name="save_recipe_by_name",
-            description="Save a recipe by searching for its name first, then saving it. More convenient than needing to know the meal ID.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "recipe_name": {
-                        "type": "string",
-                        "description": "Name of the recipe to search for and save (e.g., 'Arrabiata', 'Pad Thai')"
-                    },
-                    "filename": {
-                        "type": "string",
-                        "description": "Optional custom filename (without extension). If not provided, uses meal name."
-                    },
-                    "directory": {
-                        "type": "string",
-                        "description": "Optional directory path where to save the file. If not provided, uses default recipes directory."
-                    }
+                "filename": {
+                    "type": "string",
+                    "description": "Optional custom filename (without extension). If not provided, uses meal name."
                 },
-                "required": ["recipe_name"]
+                "directory": {
+                    "type": "string",
+                    "description": "Optional directory path where to save the file. If not provided, uses default recipes directory."
+                }
             },
-        ),
-        Tool(
-            name="list_saved_recipes",
-            description="List all recipes saved on your computer",
-            inputSchema={"type": "object", "properties": {}},
-        ),
-        Tool(
-            name="delete_saved_recipe",
-            description="Delete a saved recipe file from your computer",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "filename": {
-                        "type": "string",
-                        "description": "Name of the file to delete (with or without .pdf extension)"
-                    }
+            "required": ["meal_id"]
+        },
+    ),
+    Tool(
+        name="save_recipe_by_name",
+        description="Save a recipe by searching for its name first, then saving it. More convenient than needing to know the meal ID.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "recipe_name": {
+                    "type": "string",
+                    "description": "Name of the recipe to search for and save (e.g., 'Arrabiata', 'Pad Thai')"
                 },
-                "required": ["filename"]
-            },
-        ),
-        Tool(
-            name="list_shopping_lists",
-            description="List all existing shopping lists to check if any exist before creating a new one",
-            inputSchema={"type": "object", "properties": {}},
-        ),
-        Tool(
-            name="delete_shopping_list",
-            description="Delete a specific shopping list file",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "filename": {
-                        "type": "string",
-                        "description": "Name of the shopping list file to delete (with or without .pdf extension)"
-                    }
+                "filename": {
+                    "type": "string",
+                    "description": "Optional custom filename (without extension). If not provided, uses meal name."
                 },
-                "required": ["filename"]
+                "directory": {
+                    "type": "string",
+                    "description": "Optional directory path where to save the file. If not provided, uses default recipes directory."
+                }
             },
-        ),
-        Tool(
-            name="delete_all_shopping_lists",
-            description="Delete all shopping list files at once",
-            inputSchema={"type": "object", "properties": {}},
-        ),
-        Tool(
-            name="create_shopping_list",
-            description="Create a shopping list PDF from recipe IDs. IMPORTANT: Always call list_shopping_lists first to check for existing lists, then ask user if they want to replace or keep old ones.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "meal_ids": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of meal IDs to create shopping list from"
-                    },
-                    "replace_existing": {
-                        "type": "boolean",
-                        "description": "If true, deletes old shopping lists (keeping max 3). If false, keeps all existing lists.",
-                        "default": False
-                    },
-                    "filename": {
-                        "type": "string",
-                        "description": "Optional custom filename (without extension). If not provided, uses timestamped name."
-                    },
-                    "directory": {
-                        "type": "string",
-                        "description": "Optional directory path where to save the list. If not provided, uses default recipes directory."
-                    }
-                },
-                "required": ["meal_ids"]
+            "required": ["recipe_name"]
+        },
+    ),
+    Tool(
+        name="list_saved_recipes",
+        description="List all recipes saved on your computer",
+        inputSchema={"type": "object", "properties": {}},
+    ),
+    Tool(
+        name="delete_saved_recipe",
+        description="Delete a saved recipe file from your computer",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "filename": {
+                    "type": "string",
+                    "description": "Name of the file to delete (with or without .pdf extension)"
+                }
+            },
+            "required": ["filename"]
+        },
+    ),
+    Tool(
+        name="list_shopping_lists",
+        description="List all existing shopping lists to check if any exist before creating a new one",
+        inputSchema={"type": "object", "properties": {}},
+    ),
+    Tool(
+        name="delete_shopping_list",
+        description="Delete a specific shopping list file",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "filename": {
+                    "type": "string",
+                    "description": "Name of the shopping list file to delete (with or without .pdf extension)"
+                }
             },
-        ),
-        Tool(
-            name="create_shopping_list_from_saved",
-            description="Create a shopping list from all saved recipes automatically. No need to specify meal IDs manually.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "replace_existing": {
-                        "type": "boolean",
-                        "description": "If true, deletes old shopping lists (keeping max 3). If false, keeps all existing lists.",
-                        "default": False
-                    },
-                    "filename": {
-                        "type": "string",
-                        "description": "Optional custom filename (without extension). If not provided, uses timestamped name."
-                    }
+            "required": ["filename"]
+        },
+    ),
+    Tool(
+        name="delete_all_shopping_lists",
+        description="Delete all shopping list files at once",
+        inputSchema={"type": "object", "properties": {}},
+    ),
+    Tool(
+        name="create_shopping_list",
+        description="Create a shopping list PDF from recipe IDs. IMPORTANT: Always call list_shopping_lists first to check for existing lists, then ask user if they want to replace or keep old ones.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "meal_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of meal IDs to create shopping list from. Duplicate IDs are included once."
                 },
+                "replace_existing": {
+                    "type": "boolean",
+                    "description": "If true, deletes old shopping lists (keeping max 3). If false, keeps all existing lists.",
+                    "default": False
+                },
+                "filename": {
+                    "type": "string",
+                    "description": "Optional custom filename (without extension). If not provided, uses timestamped name."
+                },
+                "directory": {
+                    "type": "string",
+                    "description": "Optional directory path where to save the list. If not provided, uses default recipes directory."
+                }
             },
-        ),
-        Tool(
-            name="set_recipes_directory",
-            description="Set where recipes should be saved on your computer",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "directory": {
-                        "type": "string",
-                        "description": "Full path where recipes should be saved (e.g., '/home/user/recipes' or '~/Documents/recipes')"
-                    }
+            "required": ["meal_ids"]
+        },
+    ),
+    Tool(
+        name="create_shopping_list_from_saved",
+        description="Create a shopping list from all saved recipes automatically. No need to specify meal IDs manually.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "replace_existing": {
+                    "type": "boolean",
+                    "description": "If true, deletes old shopping lists (keeping max 3). If false, keeps all existing lists.",
+                    "default": False
                 },
-                "required": ["directory"]
+                "filename": {
+                    "type": "string",
+                    "description": "Optional custom filename (without extension). If not provided, uses timestamped name."
+                }
             },
-        ),
-        Tool(
-            name="get_recipes_directory",
-            description="Get the current directory where recipes are being saved",
-            inputSchema={"type": "object", "properties": {}},
-        ),
-    ]
+        },
+    ),
+    Tool(
+        name="set_recipes_directory",
+        description="Set where recipes should be saved on your computer",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "directory": {
+                    "type": "string",
+                    "description": "Full path where recipes should be saved (e.g., '/home/user/recipes' or '~/Documents/recipes')"
+                }
+            },
+            "required": ["directory"]
+        },
+    ),
+    Tool(
+        name="get_recipes_directory",
+        description="Get the current directory where recipes are being saved",
+        inputSchema={"type": "object", "properties": {}},
+    ),
+]
 
 
-async def handle_local_tool(name: str, arguments: Any) -> list[TextContent]:
+async def get_local_tool_definitions() -> list[Tool]:
+    """Return all local tool definitions."""
+    return _LOCAL_TOOLS
+
+
+# TheMealDB stores up to 20 ingredient/measure pairs as numbered fields
+_INGREDIENT_KEYS = tuple(f"strIngredient{i}" for i in range(1, 21))
+_MEASURE_KEYS = tuple(f"strMeasure{i}" for i in range(1, 21))
+
+# Index of recipe PDFs saved under RECIPES_DIR, {filename: category}, so
+# deleting a recipe doesn't have to probe every category directory
+_INDEX_FILENAME = ".index.json"
+
+
+# In-memory copy of the index: (index path, mtime_ns, index). A warm lookup
+# costs one stat() instead of reading and parsing the file, and a new
+# RECIPES_DIR or an outside edit to the file misses the cache.
+_index_cache: Optional[tuple[Path, int, dict]] = None
+
+
+def _load_index() -> dict:
+    """Load the saved-recipe index, or an empty one if missing or unreadable."""
+    global _index_cache
+    index_path = config.RECIPES_DIR / _INDEX_FILENAME
+    try:
+        mtime = os.stat(index_path).st_mtime_ns
+    except OSError:
+        return {}
+    if _index_cache is not None and _index_cache[:2] == (index_path, mtime):
+        return _index_cache[2]
+    
+    try:
+        index = orjson.loads(index_path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+    if not isinstance(index, dict):
+        return {}
+    _index_cache = (index_path, mtime, index)
+    return index
+
+
+def _save_index(index: dict) -> None:
+    """Write the saved-recipe index atomically (temp file + rename)."""
+    global _index_cache
+    index_path = config.RECIPES_DIR / _INDEX_FILENAME
+    tmp_path = index_path.with_suffix('.tmp')
+    tmp_path.write_bytes(orjson.dumps(index))
+    tmp_path.replace(index_path)
+    _index_cache = (index_path, os.stat(index_path).st_mtime_ns, index)
+
+
+def _update_index(filename: str, category: Optional[str]) -> None:
+    """Record (or, with category=None, forget) a saved recipe; best-effort."""
+    try:
+        # Copy so a failed write leaves the cached index untouched
+        index = dict(_load_index())
+        if category is None:
+            if index.pop(filename, None) is None:
+                return
+        else:
+            index[filename] = category
+        _save_index(index)
+    except OSError:
+        pass
+
+
+# Shopping list paths per directory: directory -> (dir mtime_ns, scanned_at, paths).
+# Adding or removing a file bumps the directory mtime, so a warm listing
+# costs one stat() instead of a full scan. On coarse-timestamp filesystems
+# (FAT, SMB, some NFS mounts) a change can land in the same mtime tick as
+# the scan, so a scan of a directory modified within the last tick isn't
+# cached, and no scan is trusted for longer than a short max age. Our own
+# writes and deletes also drop the entry.
+_SHOPPING_LIST_MTIME_SLACK_NS = 2_000_000_000  # FAT's 2-second timestamps
+_SHOPPING_LIST_CACHE_MAX_AGE = 60  # seconds
+_shopping_list_cache: dict[str, tuple[int, float, tuple[str, ...]]] = {}
+
+
+def _shopping_list_paths(directory) -> tuple[str, ...]:
+    """Return the shopping_list_*.pdf paths in directory, sorted by name."""
+    directory = os.fspath(directory)
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except FileNotFoundError:
+        return ()
+    
+    entry = _shopping_list_cache.get(directory)
+    if (entry is not None and entry[0] == mtime
+            and time.monotonic() - entry[1] < _SHOPPING_LIST_CACHE_MAX_AGE):
+        return entry[2]
+    
+    scanned_at = time.monotonic()
+    scan_started_ns = time.time_ns()
+    with os.scandir(directory) as entries:
+        paths = tuple(sorted(
+            entry.path for entry in entries
+            if entry.name.startswith("shopping_list_") and entry.name.endswith(".pdf")
+        ))
+    if scan_started_ns - mtime >= _SHOPPING_LIST_MTIME_SLACK_NS:
+        _shopping_list_cache[directory] = (mtime, scanned_at, paths)
+    else:
+        _shopping_list_cache.pop(directory, None)
+    return paths
+
+
+def _forget_shopping_lists(directory) -> None:
+    """Drop the cached shopping list paths for directory."""
+    _shopping_list_cache.pop(os.fspath(directory), None)
+
+
+async def _save_meal(meal: dict, custom_filename: Optional[str], custom_directory: Optional[str],
+                     intro: str = "") -> TextContent:
     """
-    Handle all local tool calls.
+    Save a meal as a recipe PDF under its category directory.
     
     Args:
-        name: Tool name
-        arguments: Tool arguments
+        meal: Dictionary containing meal data from TheMealDB API
+        custom_filename: Filename without extension, or None to use the meal name
+        custom_directory: Directory to save in, or None for RECIPES_DIR
+        intro: Text placed before the success message
         
     Returns:
-        List of TextContent responses, or None if tool not found
+        TextContent describing the saved file or the error
     """
+    # Determine save directory (plain os.path strings on this hot path;
+    # only the PDF writer gets a Path)
+    if custom_directory:
+        save_dir = os.path.expanduser(custom_directory)
+        os.makedirs(save_dir, exist_ok=True)
+    else:
+        save_dir = config.RECIPES_DIR
+    
+    meal_name = meal.get('strMeal') or ''
+    
+    # Get category and create subdirectory
+    category = (meal.get('strCategory') or 'Uncategorized').strip()
+    category_dir = os.path.join(save_dir, category)
+    os.makedirs(category_dir, exist_ok=True)
+    
+    # Generate filename
+    if custom_filename:
+        filename = f"{custom_filename}.pdf"
+    else:
+        safe_name = (meal_name or 'recipe').replace('/', '-').replace('\\', '-')
+        filename = f"{safe_name}.pdf"
+    
+    filepath = os.path.join(category_dir, filename)
+    
+    # Check if file exists
+    file_exists = os.path.exists(filepath)
+    
+    # Create PDF
     try:
-        # Tool 1: Save recipe to file
-        if name == "save_recipe_to_file":
-            meal_id = arguments.get("meal_id", "")
-            custom_filename = arguments.get("filename")
-            custom_directory = arguments.get("directory")
-            
-            # Fetch meal data
-            meal = await fetch_meal_data(meal_id)
-            
-            # Determine save directory
-            if custom_directory:
-                save_dir = Path(custom_directory).expanduser()
-                save_dir.mkdir(parents=True, exist_ok=True)
-            else:
-                save_dir = config.RECIPES_DIR
-            
-            # Get category and create subdirectory
-            category = meal.get('strCategory', 'Uncategorized').strip()
-            category_dir = save_dir / category
-            category_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Generate filename
-            if custom_filename:
-                filename = f"{custom_filename}.pdf"
-            else:
-                meal_name = meal.get('strMeal', 'recipe').replace('/', '-').replace('\\', '-')
-                filename = f"{meal_name}.pdf"
-            
-            filepath = category_dir / filename
-            
-            # Check if file exists
-            file_exists = filepath.exists()
-            
-            # Create PDF
-            try:
-                await create_recipe_pdf(meal, filepath)
-                
-                response_text = f"Recipe saved successfully"
-                if file_exists:
-                    response_text += " (replaced existing file)"
-                response_text += f"!\n\nFile: {filepath}\nRecipe: {meal.get('strMeal', 'Unknown')}\nCategory: {category}"
-                
-                return [TextContent(type="text", text=response_text)]
-            except (IOError, OSError) as e:
-                return [TextContent(
-                    type="text",
-                    text=f"File system error while creating PDF: {str(e)}. Check that you have write permissions."
-                )]
-            except ValueError as e:
-                return [TextContent(
-                    type="text",
-                    text=f"Invalid data format for recipe: {str(e)}"
-                )]
-            except Exception as e:
-                return [TextContent(
-                    type="text",
-                    text=f"Unexpected error creating PDF: {str(e)}"
-                )]
+        await create_recipe_pdf(meal, Path(filepath))
+        if not custom_directory:
+            _update_index(filename, category)
         
-        # Tool 2: Save recipe by name
-        elif name == "save_recipe_by_name":
-            import httpx
-            
-            recipe_name = arguments.get("recipe_name", "")
-            custom_filename = arguments.get("filename")
-            custom_directory = arguments.get("directory")
-            
-            # Search for the recipe
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    "https://www.themealdb.com/api/json/v1/1/search.php",
-                    params={"s": recipe_name}
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                meals = data.get("meals")
-                if not meals:
-                    return [TextContent(
-                        type="text",
-                        text=f"No recipe found with name '{recipe_name}'. Try a different search term."
-                    )]
-                
-                # If multiple results, use the first one (most relevant)
-                meal = meals[0]
-                meal_id = meal.get("idMeal")
-                
-                # Now save using the meal_id
-                result_msg = ""
-                if len(meals) > 1:
-                    result_msg = f"Found {len(meals)} recipes. Saving the first match: {meal.get('strMeal')}\n\n"
-                
-                # Determine save directory
-                if custom_directory:
-                    save_dir = Path(custom_directory).expanduser()
-                    save_dir.mkdir(parents=True, exist_ok=True)
-                else:
-                    save_dir = config.RECIPES_DIR
-                
-                # Get category and create subdirectory
-                category = meal.get('strCategory', 'Uncategorized').strip()
-                category_dir = save_dir / category
-                category_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Generate filename
-                if custom_filename:
-                    filename = f"{custom_filename}.pdf"
-                else:
-                    meal_name = meal.get('strMeal', 'recipe').replace('/', '-').replace('\\', '-')
-                    filename = f"{meal_name}.pdf"
-                
-                filepath = category_dir / filename
-                
-                # Check if file exists
-                file_exists = filepath.exists()
-                
-                # Create PDF
-                try:
-                    await create_recipe_pdf(meal, filepath)
-                    
-                    result_msg += f"Recipe saved successfully"
-                    if file_exists:
-                        result_msg += " (replaced existing file)"
-                    result_msg += f"!\n\nFile: {filepath}\nRecipe: {meal.get('strMeal', 'Unknown')}\nCategory: {category}"
-                    
-                    return [TextContent(type="text", text=result_msg)]
-                except (IOError, OSError) as e:
-                    return [TextContent(
-                        type="text",
-                        text=f"File system error while creating PDF: {str(e)}. Check that you have write permissions."
-                    )]
-                except ValueError as e:
-                    return [TextContent(
-                        type="text",
-                        text=f"Invalid data format for recipe: {str(e)}"
-                    )]
-                except Exception as e:
-                    return [TextContent(
-                        type="text",
-                        text=f"Unexpected error creating PDF: {str(e)}"
-                    )]
+        response_text = intro + "Recipe saved successfully"
+        if file_exists:
+            response_text += " (replaced existing file)"
+        response_text += f"!\n\nFile: {filepath}\nRecipe: {meal_name or 'Unknown'}\nCategory: {category}"
         
-        # Tool 3: List saved recipes
-        elif name == "list_saved_recipes":
-            result = "Saved recipes by category:\n\n"
-            total_files = 0
-            
-            # Get all category directories
-            if not config.RECIPES_DIR.exists():
-                return [TextContent(type="text", text=f"No recipes directory found.\n\nDirectory: {config.RECIPES_DIR}")]
-            
-            for category_dir in sorted(config.RECIPES_DIR.iterdir()):
-                if category_dir.is_dir() and not category_dir.name.startswith('.'):
-                    files = sorted(category_dir.glob("*.pdf"))
-                    if files:
-                        result += f"{category_dir.name} ({len(files)})\n"
-                        for i, filepath in enumerate(files, 1):
-                            size = filepath.stat().st_size / 1024  # Convert to KB
-                            modified = datetime.fromtimestamp(filepath.stat().st_mtime)
-                            result += f"   {i}. {filepath.stem}\n"
-                            result += f"      Size: {size:.1f} KB | Modified: {modified.strftime('%Y-%m-%d %H:%M')}\n"
-                        result += "\n"
-                        total_files += len(files)
-            
-            if total_files == 0:
-                return [TextContent(type="text", text=f"No saved recipes found.\n\nDirectory: {config.RECIPES_DIR}")]
-            
-            result += f"Total recipes: {total_files}\nDirectory: {config.RECIPES_DIR}"
-            return [TextContent(type="text", text=result)]
+        return TextContent(type="text", text=response_text)
+    except (IOError, OSError) as e:
+        return TextContent(
+            type="text",
+            text=f"File system error while creating PDF: {str(e)}. Check that you have write permissions."
+        )
+    except ValueError as e:
+        return TextContent(
+            type="text",
+            text=f"Invalid data format for recipe: {str(e)}"
+        )
+    except Exception as e:
+        return TextContent(
+            type="text",
+            text=f"Unexpected error creating PDF: {str(e)}"
+        )
+
+
+async def _save_recipe_to_file(arguments: Any) -> list[TextContent]:
+    """Tool 1: Save recipe to file."""
+    meal_id = arguments.get("meal_id", "")
+    custom_filename = arguments.get("filename")
+    custom_directory = arguments.get("directory")
+    
+    # Fetch meal data
+    meal = await fetch_meal_data(meal_id)
+    
+    return [await _save_meal(meal, custom_filename, custom_directory)]
+
+
+async def _save_recipe_by_name(arguments: Any) -> list[TextContent]:
+    """Tool 2: Save recipe by name."""
+    recipe_name = arguments.get("recipe_name", "")
+    custom_filename = arguments.get("filename")
+    custom_directory = arguments.get("directory")
+    
+    # Search for the recipe through the shared client
+    response = await get_client().get(f"{API_BASE}/search.php", params={"s": recipe_name})
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+    
+    meals = data.get("meals")
+    if not meals:
+        return [TextContent(
+            type="text",
+            text=f"No recipe found with name '{recipe_name}'. Try a different search term."
+        )]
+    
+    # If multiple results, use the first one (most relevant)
+    meal = meals[0]
+    
+    intro = ""
+    if len(meals) > 1:
+        intro = f"Found {len(meals)} recipes. Saving the first match: {meal.get('strMeal')}\n\n"
+    
+    return [await _save_meal(meal, custom_filename, custom_directory, intro)]
+
+
+async def _list_saved_recipes(arguments: Any) -> list[TextContent]:
+    """Tool 3: List saved recipes."""
+    recipes_dir = config.RECIPES_DIR
+    parts = ["Saved recipes by category:\n\n"]
+    total_files = 0
+    
+    # Get all category directories
+    if not recipes_dir.exists():
+        return [TextContent(type="text", text=f"No recipes directory found.\n\nDirectory: {recipes_dir}")]
+    
+    # One directory pass per level; DirEntry caches the file type,
+    # hidden entries are skipped by name before any type check,
+    # and each PDF is stat()ed once for both size and mtime
+    with os.scandir(recipes_dir) as entries:
+        category_dirs = sorted(
+            (entry for entry in entries if not entry.name.startswith('.') and entry.is_dir()),
+            key=lambda entry: entry.name
+        )
+    
+    for category_dir in category_dirs:
+        with os.scandir(category_dir.path) as entries:
+            files = sorted(
+                ((entry.name, entry.stat()) for entry in entries
+                 if entry.name.endswith('.pdf') and entry.is_file()),
+                key=lambda item: item[0]
+            )
+        if files:
+            parts.append(f"{category_dir.name} ({len(files)})\n")
+            for i, (filename, stat) in enumerate(files, 1):
+                size = stat.st_size / 1024  # Convert to KB
+                modified = time.strftime('%Y-%m-%d %H:%M', time.localtime(stat.st_mtime))
+                parts.append(
+                    f"   {i}. {filename[:-len('.pdf')]}\n"
+                    f"      Size: {size:.1f} KB | Modified: {modified}\n"
+                )
+            parts.append("\n")
+            total_files += len(files)
+    
+    if total_files == 0:
+        return [TextContent(type="text", text=f"No saved recipes found.\n\nDirectory: {recipes_dir}")]
+    
+    parts.append(f"Total recipes: {total_files}\nDirectory: {recipes_dir}")
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def _delete_saved_recipe(arguments: Any) -> list[TextContent]:
+    """Tool 4: Delete saved recipe."""
+    recipes_dir = config.RECIPES_DIR
+    filename = arguments.get("filename", "")
+    
+    # Add .pdf if not present
+    if not filename.endswith('.pdf'):
+        filename += '.pdf'
+    
+    # Try the index first, then search all category directories
+    found = False
+    filepath = None
+    
+    category = _load_index().get(filename)
+    if category is not None:
+        potential_path = recipes_dir / category / filename
+        if potential_path.exists():
+            filepath = potential_path
+            found = True
+    
+    if not found:
+        for category_dir in recipes_dir.iterdir():
+            if category_dir.is_dir():
+                potential_path = category_dir / filename
+                if potential_path.exists():
+                    filepath = potential_path
+                    found = True
+                    break
+    
+    if not found:
+        return [TextContent(
+            type="text",
+            text=f"Recipe not found: {filename}\n\nTip: Use 'list_saved_recipes' to see available recipes."
+        )]
+    
+    filepath.unlink()
+    _update_index(filename, None)
+    
+    return [TextContent(
+        type="text",
+        text=f"Recipe deleted successfully!\n\nDeleted: {filename}"
+    )]
+
+
+async def _list_shopping_lists(arguments: Any) -> list[TextContent]:
+    """Tool 5: List shopping lists."""
+    recipes_dir = config.RECIPES_DIR
+    shopping_lists = _shopping_list_paths(recipes_dir)
+    
+    if not shopping_lists:
+        return [TextContent(
+            type="text",
+            text=f"No shopping lists found.\n\nDirectory: {recipes_dir}"
+        )]
+    
+    parts = [f"Found {len(shopping_lists)} shopping list(s):\n\n"]
+    for i, filepath in enumerate(shopping_lists, 1):
+        stat = os.stat(filepath)
+        size = stat.st_size / 1024
+        modified = time.strftime('%Y-%m-%d at %H:%M', time.localtime(stat.st_mtime))
+        parts.append(f"{i}. {os.path.basename(filepath)}\n   Size: {size:.1f} KB | Modified: {modified}\n\n")
+    
+    parts.append(f"Directory: {recipes_dir}")
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def _delete_shopping_list(arguments: Any) -> list[TextContent]:
+    """Tool 6: Delete shopping list."""
+    filename = arguments.get("filename", "")
+    
+    # Add .pdf if not present
+    if not filename.endswith('.pdf'):
+        filename += '.pdf'
+    
+    filepath = config.RECIPES_DIR / filename
+    
+    if not filepath.exists():
+        return [TextContent(
+            type="text",
+            text=f"Shopping list not found: {filename}\n\nTip: Use 'list_shopping_lists' to see available lists."
+        )]
+    
+    filepath.unlink()
+    _forget_shopping_lists(config.RECIPES_DIR)
+    
+    return [TextContent(
+        type="text",
+        text=f"Shopping list deleted successfully!\n\nDeleted: {filename}"
+    )]
+
+
+async def _delete_all_shopping_lists(arguments: Any) -> list[TextContent]:
+    """Tool 7: Delete all shopping lists."""
+    recipes_dir = config.RECIPES_DIR
+    shopping_lists = _shopping_list_paths(recipes_dir)
+    
+    if not shopping_lists:
+        return [TextContent(
+            type="text",
+            text=f"No shopping lists found to delete.\n\nDirectory: {recipes_dir}"
+        )]
+    
+    count = len(shopping_lists)
+    for filepath in shopping_lists:
+        os.unlink(filepath)
+    _forget_shopping_lists(recipes_dir)
+    
+    return [TextContent(
+        type="text",
+        text=f"Successfully deleted {count} shopping list(s)!"
+    )]
+
+
+def _aggregate_ingredients(meals: list[dict]) -> tuple[list[str], dict[str, dict]]:
+    """
+    Merge the ingredients of several meals for a shopping list.
+    
+    Args:
+        meals: Meal dicts as returned by fetch_meal_data
         
-        # Tool 4: Delete saved recipe
-        elif name == "delete_saved_recipe":
-            filename = arguments.get("filename", "")
-            
-            # Add .pdf if not present
-            if not filename.endswith('.pdf'):
-                filename += '.pdf'
-            
-            # Search for the file in all category directories
-            found = False
-            filepath = None
-            
-            for category_dir in config.RECIPES_DIR.iterdir():
-                if category_dir.is_dir():
-                    potential_path = category_dir / filename
-                    if potential_path.exists():
-                        filepath = potential_path
-                        found = True
-                        break
-            
-            if not found:
-                return [TextContent(
-                    type="text",
-                    text=f"Recipe not found: {filename}\n\nTip: Use 'list_saved_recipes' to see available recipes."
-                )]
-            
-            filepath.unlink()
-            
-            return [TextContent(
-                type="text",
-                text=f"Recipe deleted successfully!\n\nDeleted: {filename}"
-            )]
+    Returns:
+        The meal names, and {ingredient_lower: {'original': name,
+        'measures': [measures], 'recipes': [recipe_names]}}
+    """
+    all_ingredients = {}
+    meal_names = []
+    
+    for meal in meals:
+        meal_name = meal.get('strMeal') or 'Unknown'
+        meal_names.append(meal_name)
         
-        # Tool 5: List shopping lists
-        elif name == "list_shopping_lists":
-            shopping_lists = sorted(config.RECIPES_DIR.glob("shopping_list_*.pdf"))
-            
-            if not shopping_lists:
-                return [TextContent(
-                    type="text",
-                    text=f"No shopping lists found.\n\nDirectory: {config.RECIPES_DIR}"
-                )]
-            
-            result = f"Found {len(shopping_lists)} shopping list(s):\n\n"
-            for i, filepath in enumerate(shopping_lists, 1):
-                size = filepath.stat().st_size / 1024
-                modified = datetime.fromtimestamp(filepath.stat().st_mtime)
-                result += f"{i}. {filepath.name}\n"
-                result += f"   Size: {size:.1f} KB | Modified: {modified.strftime('%Y-%m-%d at %H:%M')}\n\n"
-            
-            result += f"Directory: {config.RECIPES_DIR}"
-            return [TextContent(type="text", text=result)]
+        for ing_key_name, meas_key_name in zip(_INGREDIENT_KEYS, _MEASURE_KEYS):
+            ingredient = (meal.get(ing_key_name) or "").strip()
+            if ingredient:
+                measure = (meal.get(meas_key_name) or "").strip()
+                entry = all_ingredients.setdefault(ingredient.lower(), {
+                    'original': ingredient,
+                    'measures': [],
+                    'recipes': []
+                })
+                if measure:
+                    entry['measures'].append(measure)
+                entry['recipes'].append(meal_name)
+    
+    return meal_names, all_ingredients
+
+
+async def _create_shopping_list(arguments: Any) -> list[TextContent]:
+    """Tool 8: Create shopping list."""
+    # Drop duplicate IDs (keeping first-seen order) so each meal is fetched
+    # and counted once
+    meal_ids = list(dict.fromkeys(arguments.get("meal_ids", [])))
+    replace_existing = arguments.get("replace_existing", False)
+    custom_filename = arguments.get("filename")
+    custom_directory = arguments.get("directory")
+    
+    if not meal_ids:
+        return [TextContent(type="text", text="No meal IDs provided")]
+    
+    # Determine save directory
+    if custom_directory:
+        save_dir = os.path.expanduser(custom_directory)
+        os.makedirs(save_dir, exist_ok=True)
+    else:
+        save_dir = config.RECIPES_DIR
+    
+    # Handle existing shopping lists
+    existing_lists = _shopping_list_paths(save_dir)
+    
+    if replace_existing and existing_lists:
+        # Keep only the 2 most recent (so we can add 1 new one = max 3)
+        lists_to_delete = existing_lists[:-2] if len(existing_lists) > 2 else []
+        for old_list in lists_to_delete:
+            os.unlink(old_list)
+        _forget_shopping_lists(save_dir)
         
-        # Tool 6: Delete shopping list
-        elif name == "delete_shopping_list":
-            filename = arguments.get("filename", "")
-            
-            # Add .pdf if not present
-            if not filename.endswith('.pdf'):
-                filename += '.pdf'
-            
-            filepath = config.RECIPES_DIR / filename
-            
-            if not filepath.exists():
-                return [TextContent(
-                    type="text",
-                    text=f"Shopping list not found: {filename}\n\nTip: Use 'list_shopping_lists' to see available lists."
-                )]
-            
-            filepath.unlink()
-            
-            return [TextContent(
-                type="text",
-                text=f"Shopping list deleted successfully!\n\nDeleted: {filename}"
-            )]
+        deleted_count = len(lists_to_delete)
+    else:
+        deleted_count = 0
+    
+    # Fetch all meals concurrently (results keep the meal_ids order). A
+    # TaskGroup cancels the remaining fetches as soon as one fails
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(fetch_meal_data(meal_id)) for meal_id in meal_ids]
+    except ExceptionGroup as eg:
+        # Report an unknown meal ID ahead of other failures, and raise the
+        # leaf exception itself with the whole group kept as its cause
+        not_found, _ = eg.split(ValueError)
+        error = not_found or eg
+        while isinstance(error, BaseExceptionGroup):
+            error = error.exceptions[0]
+        raise error from eg
+    meal_names, all_ingredients = _aggregate_ingredients([task.result() for task in tasks])
+    
+    # Generate filename
+    if custom_filename:
+        filename = f"{custom_filename}.pdf"
+    else:
+        filename = f"shopping_list_{time.strftime('%Y%m%d_%H%M%S')}.pdf"
+    
+    filepath = os.path.join(save_dir, filename)
+    
+    try:
+        await asyncio.to_thread(create_shopping_list_pdf, meal_names, all_ingredients, Path(filepath))
+        _forget_shopping_lists(save_dir)
         
-        # Tool 7: Delete all shopping lists
-        elif name == "delete_all_shopping_lists":
-            shopping_lists = list(config.RECIPES_DIR.glob("shopping_list_*.pdf"))
-            
-            if not shopping_lists:
-                return [TextContent(
-                    type="text",
-                    text=f"No shopping lists found to delete.\n\nDirectory: {config.RECIPES_DIR}"
-                )]
-            
-            count = len(shopping_lists)
-            for filepath in shopping_lists:
-                filepath.unlink()
-            
-            return [TextContent(
-                type="text",
-                text=f"Successfully deleted {count} shopping list(s)!"
-            )]
+        # Build response
+        summary = f"Shopping list created successfully!\n\n"
+        summary += f"File: {filepath}\n"
+        summary += f"Recipes ({len(meal_names)}):\n"
+        for i, name in enumerate(meal_names, 1):
+            summary += f"   {i}. {name}\n"
+        summary += f"\nTotal ingredients: {len(all_ingredients)}\n"
         
-        # Tool 8: Create shopping list
-        elif name == "create_shopping_list":
-            meal_ids = arguments.get("meal_ids", [])
-            replace_existing = arguments.get("replace_existing", False)
-            custom_filename = arguments.get("filename")
-            custom_directory = arguments.get("directory")
-            
-            if not meal_ids:
-                return [TextContent(type="text", text="No meal IDs provided")]
-            
-            # Determine save directory
-            if custom_directory:
-                save_dir = Path(custom_directory).expanduser()
-                save_dir.mkdir(parents=True, exist_ok=True)
-            else:
-                save_dir = config.RECIPES_DIR
-            
-            # Handle existing shopping lists
-            existing_lists = sorted(save_dir.glob("shopping_list_*.pdf"))
-            
-            if replace_existing and existing_lists:
-                # Keep only the 2 most recent (so we can add 1 new one = max 3)
-                lists_to_delete = existing_lists[:-2] if len(existing_lists) > 2 else []
-                for old_list in lists_to_delete:
-                    old_list.unlink()
-                
-                deleted_count = len(lists_to_delete)
-            else:
-                deleted_count = 0
-            
-            # Structure: {ingredient_lower: {'original': name, 'measures': [measures], 'recipes': [recipe_names]}}
-            all_ingredients = {}
-            meal_names = []
-            
-            # Fetch all meals
-            for meal_id in meal_ids:
-                meal = await fetch_meal_data(meal_id)
-                meal_name = meal.get('strMeal', 'Unknown')
-                meal_names.append(meal_name)
-                
-                # Collect ingredients
-                for i in range(1, 21):
-                    ingredient = meal.get(f"strIngredient{i}", "")
-                    measure = meal.get(f"strMeasure{i}", "")
-                    if ingredient and ingredient.strip():
-                        ing_key = ingredient.strip().lower()
-                        if ing_key not in all_ingredients:
-                            all_ingredients[ing_key] = {
-                                'original': ingredient.strip(),
-                                'measures': [],
-                                'recipes': []
-                            }
-                        if measure.strip():
-                            all_ingredients[ing_key]['measures'].append(measure.strip())
-                        all_ingredients[ing_key]['recipes'].append(meal_name)
-            
-            # Generate filename
-            if custom_filename:
-                filename = f"{custom_filename}.pdf"
-            else:
-                filename = f"shopping_list_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            
-            filepath = save_dir / filename
-            
-            try:
-                create_shopping_list_pdf(meal_names, all_ingredients, filepath)
-                
-                # Build response
-                summary = f"Shopping list created successfully!\n\n"
-                summary += f"File: {filepath}\n"
-                summary += f"Recipes ({len(meal_names)}):\n"
-                for i, name in enumerate(meal_names, 1):
-                    summary += f"   {i}. {name}\n"
-                summary += f"\nTotal ingredients: {len(all_ingredients)}\n"
-                
-                if deleted_count > 0:
-                    summary += f"Deleted {deleted_count} old shopping list(s) to keep max 3\n"
-                
-                # Check current count
-                current_lists = list(save_dir.glob("shopping_list_*.pdf"))
-                summary += f"Total shopping lists: {len(current_lists)}"
-                
-                return [TextContent(type="text", text=summary)]
-            except Exception as e:
-                return [TextContent(
-                    type="text",
-                    text=f"Failed to create shopping list PDF: {str(e)}"
-                )]
+        if deleted_count > 0:
+            summary += f"Deleted {deleted_count} old shopping list(s) to keep max 3\n"
         
-        # Tool 9: Create shopping list from saved recipes
-        elif name == "create_shopping_list_from_saved":
-            replace_existing = arguments.get("replace_existing", False)
-            custom_filename = arguments.get("filename")
-            
-            # Get all saved recipe PDFs and extract meal IDs from them
-            meal_ids = []
-            meal_names_from_files = []
-            
-            # We need to parse the PDFs or maintain a mapping
-            # For now, let's return an error message guiding the user
-            return [TextContent(
-                type="text",
-                text="This feature requires recipe metadata storage which isn't implemented yet.\n\nWorkaround:\n1. List your saved recipes with 'list_saved_recipes'\n2. Look up each recipe by name to get its ID\n3. Use 'create_shopping_list' with those IDs\n\nOr, I can help you create a shopping list if you tell me which saved recipes you want to include!"
-            )]
+        # Check current count
+        current_lists = _shopping_list_paths(save_dir)
+        summary += f"Total shopping lists: {len(current_lists)}"
         
-        # Tool 10: Set recipes directory
-        elif name == "set_recipes_directory":
-            directory = arguments.get("directory", "")
-            
-            if not directory:
-                return [TextContent(type="text", text="Directory path is required")]
-            
-            try:
-                new_dir = config.save_recipes_dir(directory)
-                # Update the module-level variable
-                config.RECIPES_DIR = new_dir
-                
-                return [TextContent(
-                    type="text",
-                    text=f"Recipes directory updated!\n\nNew location: {new_dir}"
-                )]
-            except Exception as e:
-                return [TextContent(type="text", text=f"Failed to set directory: {str(e)}")]
+        return [TextContent(type="text", text=summary)]
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=f"Failed to create shopping list PDF: {str(e)}"
+        )]
+
+
+async def _create_shopping_list_from_saved(arguments: Any) -> list[TextContent]:
+    """Tool 9: Create shopping list from saved recipes."""
+    replace_existing = arguments.get("replace_existing", False)
+    custom_filename = arguments.get("filename")
+    
+    # Get all saved recipe PDFs and extract meal IDs from them
+    meal_ids = []
+    meal_names_from_files = []
+    
+    # We need to parse the PDFs or maintain a mapping
+    # For now, let's return an error message guiding the user
+    return [TextContent(
+        type="text",
+        text="This feature requires recipe metadata storage which isn't implemented yet.\n\nWorkaround:\n1. List your saved recipes with 'list_saved_recipes'\n2. Look up each recipe by name to get its ID\n3. Use 'create_shopping_list' with those IDs\n\nOr, I can help you create a shopping list if you tell me which saved recipes you want to include!"
+    )]
+
+
+async def _set_recipes_directory(arguments: Any) -> list[TextContent]:
+    """Tool 10: Set recipes directory."""
+    directory = arguments.get("directory", "")
+    
+    if not directory:
+        return [TextContent(type="text", text="Directory path is required")]
+    
+    try:
+        new_dir = await config.save_recipes_dir_async(directory)
+        # Update the module-level variable
+        config.RECIPES_DIR = new_dir
         
-        # Tool 11: Get recipes directory
-        elif name == "get_recipes_directory":
-            return [TextContent(
-                type="text",
-                text=f"Current recipes directory:\n{config.RECIPES_DIR}"
-            )]
+        return [TextContent(
+            type="text",
+            text=f"Recipes directory updated!\n\nNew location: {new_dir}"
+        )]
+    except Exception as e:
+        return [TextContent(type="text", text=f"Failed to set directory: {str(e)}")]
+
+
+async def _get_recipes_directory(arguments: Any) -> list[TextContent]:
+    """Tool 11: Get recipes directory."""
+    return [TextContent(
+        type="text",
+        text=f"Current recipes directory:\n{config.RECIPES_DIR}"
+    )]
+
+
+# Tool name -> handler coroutine
+_HANDLERS: dict[str, Callable[[Any], Awaitable[list[TextContent]]]] = {
+    "save_recipe_to_file": _save_recipe_to_file,
+    "save_recipe_by_name": _save_recipe_by_name,
+    "list_saved_recipes": _list_saved_recipes,
+    "delete_saved_recipe": _delete_saved_recipe,
+    "list_shopping_lists": _list_shopping_lists,
+    "delete_shopping_list": _delete_shopping_list,
+    "delete_all_shopping_lists": _delete_all_shopping_lists,
+    "create_shopping_list": _create_shopping_list,
+    "create_shopping_list_from_saved": _create_shopping_list_from_saved,
+    "set_recipes_directory": _set_recipes_directory,
+    "get_recipes_directory": _get_recipes_directory,
+}
+
+
+async def handle_local_tool(name: str, arguments: Any) -> list[TextContent]:
+    """
+    Handle all local tool calls.
+    
+    Args:
+        name: Tool name
+        arguments: Tool arguments
         
-        else:
-            return None  # Not a local tool
+    Returns:
+        List of TextContent responses, or None if tool not found
+    """
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return None  # Not a local tool
     
+    try:
+        return await handler(arguments)
     except Exception as e:
-        return [TextContent(type="text", text=f"Error: {str(e)}")]
\ No newline at end of file
+        return [TextContent(type="text", text=f"Error: {str(e)}")]
@@ -4,12 +4,11 @@ Tests all API tool functions including HTTP requests, response formatting, and e
 """
 
 import unittest
+import asyncio
+import httpx
+import orjson
+from types import SimpleNamespace
 from unittest.mock import patch, AsyncMock, MagicMock
-import sys
-from pathlib import Path
-
-# Add the parent directory to the path so we can import from src
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.tools.api_tools import (
     handle_api_tool,
@@ -17,42 +16,80 @@ from src.tools.api_tools import (
     format_full_meal,
     format_meal_summary,
     format_category,
+    format_ingredient_line,
+)
+import src.tools.api_tools as api_tools
+
+
+# Shared read-only sample data, built once at import
+SAMPLE_MEAL = {
+    "idMeal": "52772",
+    "strMeal": "Teriyaki Chicken",
+    "strCategory": "Chicken",
+    "strArea": "Japanese",
+    "strTags": "Meat,Casserole",
+    "strIngredient1": "soy sauce",
+    "strMeasure1": "3 tbs",
+    "strIngredient2": "water",
+    "strMeasure2": "3 tbs",
+    "strIngredient3": "brown sugar",
+    "strMeasure3": "2 tbs",
+    "strIngredient4": "",
+    "strMeasure4": "",
+    "strInstructions": "Mix ingredients and cook.",
+    "strMealThumb": "https://example.com/image.jpg",
+    "strYoutube": "https://youtube.com/watch?v=test",
+}
+
+SAMPLE_CATEGORY = {
+    "strCategory": "Seafood",
+    "strCategoryThumb": "https://example.com/seafood.jpg",
+    "strCategoryDescription": "Fish, shellfish, and other seafood dishes from around the world.",
+}
+
+MOCK_MEAL = {
+    "idMeal": "52772",
+    "strMeal": "Teriyaki Chicken",
+    "strCategory": "Chicken",
+    "strArea": "Japanese",
+    "strTags": "Meat",
+    "strIngredient1": "soy sauce",
+    "strMeasure1": "3 tbs",
+    "strIngredient2": "",
+    "strMeasure2": "",
+    "strInstructions": "Cook it.",
+    "strMealThumb": "https://example.com/image.jpg",
+}
+
+MOCK_CATEGORY = {
+    "strCategory": "Seafood",
+    "strCategoryThumb": "https://example.com/seafood.jpg",
+    "strCategoryDescription": "Seafood dishes",
+}
+
+# 150 ingredients, more than list_all_ingredients shows
+MANY_INGREDIENTS = tuple(
+    {"strIngredient": f"Ingredient{i}", "strDescription": ""}
+    for i in range(150)
 )
 
 
+def _response(payload, status_code=200, headers=None):
+    """Minimal stand-in for an httpx.Response with payload as its JSON body."""
+    return SimpleNamespace(
+        status_code=status_code,
+        headers=headers or {},
+        content=orjson.dumps(payload),
+        raise_for_status=lambda: None,
+    )
+
+
 class TestFormatters(unittest.TestCase):
     """Test formatting functions."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.sample_meal = {
-            "idMeal": "52772",
-            "strMeal": "Teriyaki Chicken",
-            "strCategory": "Chicken",
-            "strArea": "Japanese",
-            "strTags": "Meat,Casserole",
-            "strIngredient1": "soy sauce",
-            "strMeasure1": "3 tbs",
-            "strIngredient2": "water",
-            "strMeasure2": "3 tbs",
-            "strIngredient3": "brown sugar",
-            "strMeasure3": "2 tbs",
-            "strIngredient4": "",
-            "strMeasure4": "",
-            "strInstructions": "Mix ingredients and cook.",
-            "strMealThumb": "https://example.com/image.jpg",
-            "strYoutube": "https://youtube.com/watch?v=test",
-        }
-        
-        self.sample_category = {
-            "strCategory": "Seafood",
-            "strCategoryThumb": "https://example.com/seafood.jpg",
-            "strCategoryDescription": "Fish, shellfish, and other seafood dishes from around the world.",
-        }
-    
     def test_format_full_meal(self):
         """Test formatting a full meal."""
-        result = format_full_meal(self.sample_meal)
+        result = format_full_meal(SAMPLE_MEAL)
         
         self.assertIn("Teriyaki Chicken", result)
         self.assertIn("52772", result)
@@ -80,8 +117,7 @@ class TestFormatters(unittest.TestCase):
     
     def test_format_full_meal_no_video(self):
         """Test formatting a meal without YouTube video."""
-        meal = self.sample_meal.copy()
-        meal["strYoutube"] = None
+        meal = {**SAMPLE_MEAL, "strYoutube": None}
         
         result = format_full_meal(meal)
         self.assertIn("Teriyaki Chicken", result)
@@ -89,16 +125,24 @@ class TestFormatters(unittest.TestCase):
     
     def test_format_full_meal_no_image(self):
         """Test formatting a meal without image."""
-        meal = self.sample_meal.copy()
-        meal["strMealThumb"] = ""
+        meal = {**SAMPLE_MEAL, "strMealThumb": ""}
         
         result = format_full_meal(meal)
         self.assertIn("Teriyaki Chicken", result)
         self.assertNotIn("View Recipe Image", result)
     
+    def test_format_full_meal_null_fields(self):
+        """Test formatting a meal whose unused slots are null, as the API returns them."""
+        meal = {**SAMPLE_MEAL, "strMeasure2": None, "strIngredient5": None}
+        
+        result = format_full_meal(meal)
+        self.assertIn("  - 3 tbs soy sauce", result)
+        self.assertIn("  -  water", result)
+        self.assertIn("  - 2 tbs brown sugar", result)
+    
     def test_format_meal_summary(self):
         """Test formatting a meal summary."""
-        result = format_meal_summary(self.sample_meal)
+        result = format_meal_summary(SAMPLE_MEAL)
         
         self.assertIn("Teriyaki Chicken", result)
         self.assertIn("52772", result)
@@ -109,17 +153,25 @@ class TestFormatters(unittest.TestCase):
     
     def test_format_meal_summary_no_image(self):
         """Test formatting a meal summary without image."""
-        meal = self.sample_meal.copy()
-        meal["strMealThumb"] = ""
+        meal = {**SAMPLE_MEAL, "strMealThumb": ""}
         
         result = format_meal_summary(meal)
         self.assertIn("Teriyaki Chicken", result)
         self.assertIn("52772", result)
         self.assertNotIn("[", result)  # No markdown link
     
+    def test_format_meal_summary_cached(self):
+        """Test that formatting the same meal again reuses the cached string."""
+        api_tools._format_meal_summary.cache_clear()
+        first = format_meal_summary(SAMPLE_MEAL)
+        second = format_meal_summary(dict(SAMPLE_MEAL))
+        
+        self.assertIs(first, second)
+        self.assertEqual(api_tools._format_meal_summary.cache_info().hits, 1)
+    
     def test_format_category(self):
         """Test formatting a category."""
-        result = format_category(self.sample_category)
+        result = format_category(SAMPLE_CATEGORY)
         
         self.assertIn("Seafood", result)
         self.assertIn("Fish, shellfish", result)
@@ -141,20 +193,30 @@ class TestFormatters(unittest.TestCase):
     
     def test_format_category_no_image(self):
         """Test formatting a category without image."""
-        category = self.sample_category.copy()
-        category["strCategoryThumb"] = ""
+        category = {**SAMPLE_CATEGORY, "strCategoryThumb": ""}
         
         result = format_category(category)
         self.assertIn("Seafood", result)
         self.assertNotIn("View Category Image", result)
 
+    
+    def test_format_ingredient_line(self):
+        """Test ingredient lines with and without descriptions."""
+        self.assertEqual(format_ingredient_line({"strIngredient": "Salt"}), "- **Salt**\n")
+        self.assertEqual(
+            format_ingredient_line({"strIngredient": "Salt", "strDescription": None}),
+            "- **Salt**\n",
+        )
+        line = format_ingredient_line({"strIngredient": "Salt", "strDescription": "S" * 150})
+        self.assertEqual(line, "- **Salt** - " + "S" * 100 + "...\n")
+
 
-class TestToolDefinitions(unittest.TestCase):
+class TestToolDefinitions(unittest.IsolatedAsyncioTestCase):
     """Test tool definitions."""
     
-    def test_get_tool_definitions(self):
+    async def test_get_tool_definitions(self):
         """Test that all tools are defined correctly."""
-        tools = get_api_tool_definitions()
+        tools = await get_api_tool_definitions()
         
         # Should have 11 tools
         self.assertEqual(len(tools), 11)
@@ -176,50 +238,54 @@ class TestToolDefinitions(unittest.TestCase):
         ]
         self.assertEqual(tool_names, expected_names)
     
-    def test_tool_schemas(self):
+    async def test_tool_schemas(self):
         """Test that each tool has proper input schema."""
-        tools = get_api_tool_definitions()
+        tools = await get_api_tool_definitions()
         
         for tool in tools:
             self.assertIsNotNone(tool.inputSchema)
             self.assertEqual(tool.inputSchema["type"], "object")
+    
+    async def test_definitions_built_once(self):
+        """Test that the same prebuilt list is returned on every call."""
+        self.assertIs(await get_api_tool_definitions(), await get_api_tool_definitions())
 
 
-class TestAPIToolHandlers(unittest.IsolatedAsyncioTestCase):
-    """Test API tool handlers using async tests."""
+class MockTransportTestCase(unittest.IsolatedAsyncioTestCase):
+    """Base for tests that route the shared client through an in-memory transport."""
     
     def setUp(self):
-        """Set up test data."""
-        self.mock_meal = {
-            "idMeal": "52772",
-            "strMeal": "Teriyaki Chicken",
-            "strCategory": "Chicken",
-            "strArea": "Japanese",
-            "strTags": "Meat",
-            "strIngredient1": "soy sauce",
-            "strMeasure1": "3 tbs",
-            "strIngredient2": "",
-            "strMeasure2": "",
-            "strInstructions": "Cook it.",
-            "strMealThumb": "https://example.com/image.jpg",
-        }
-        
-        self.mock_category = {
-            "strCategory": "Seafood",
-            "strCategoryThumb": "https://example.com/seafood.jpg",
-            "strCategoryDescription": "Seafood dishes",
-        }
+        """Install a fresh mock-transport client and empty the response cache."""
+        api_tools._cache.clear()
+        self.payload = None
+        self.requests = []
+        api_tools._client = httpx.AsyncClient(
+            base_url=api_tools.API_BASE,
+            transport=httpx.MockTransport(self._respond),
+        )
+    
+    async def asyncTearDown(self):
+        """Close the per-test client."""
+        await api_tools.close_api_client()
+    
+    def respond_with(self, payload):
+        """Serve payload as the JSON body of every request (raise it if it's an exception)."""
+        self.payload = payload
+    
+    def _respond(self, request):
+        self.requests.append(request)
+        if isinstance(self.payload, BaseException):
+            raise self.payload
+        return httpx.Response(200, content=orjson.dumps(self.payload))
+
+
+class TestAPIToolHandlers(MockTransportTestCase):
+    """Test API tool handlers using async tests."""
     
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_search_meal_by_name(self, mock_client):
+    async def test_search_meal_by_name(self):
         """Test searching for a meal by name."""
         # Mock the HTTP response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"meals": [self.mock_meal]}
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
+        self.respond_with({"meals": [MOCK_MEAL]})
         
         result = await handle_api_tool("search_meal_by_name", {"name": "chicken"})
         
@@ -227,42 +293,82 @@ class TestAPIToolHandlers(unittest.IsolatedAsyncioTestCase):
         self.assertIn("Teriyaki Chicken", result[0].text)
         self.assertIn("52772", result[0].text)
         self.assertIn("What would you like to do?", result[0].text)
-        mock_get.assert_called_once()
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.requests[0].url.path, "/api/json/v1/1/search.php")
+        self.assertEqual(self.requests[0].url.params["s"], "chicken")
     
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_search_meal_by_name_no_results(self, mock_client):
-        """Test searching with no results."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"meals": None}
-        mock_response.raise_for_status = MagicMock()
+    @patch('src.tools.api_tools.asyncio.to_thread', new_callable=AsyncMock)
+    async def test_search_many_meals_rendered_in_thread(self, mock_to_thread):
+        """Test that large search results are rendered off the event loop."""
+        meals = [dict(MOCK_MEAL, idMeal=str(i)) for i in range(11)]
+        self.respond_with({"meals": meals})
+        mock_to_thread.return_value = "rendered"
         
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
+        result = await handle_api_tool("search_meal_by_name", {"name": "chicken"})
+        
+        mock_to_thread.assert_awaited_once_with(api_tools._render_full_meals, meals)
+        self.assertIn("Found 11 meal(s)", result[0].text)
+        self.assertIn("rendered", result[0].text)
+    
+    async def test_search_meal_by_name_no_results(self):
+        """Test searching with no results."""
+        self.respond_with({"meals": None})
         
         result = await handle_api_tool("search_meal_by_name", {"name": "nonexistent"})
         
         self.assertEqual(len(result), 1)
         self.assertIn("No meals found", result[0].text)
     
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_list_meals_by_first_letter(self, mock_client):
-        """Test listing meals by first letter."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"meals": [self.mock_meal]}
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
-        
-        result = await handle_api_tool("list_meals_by_first_letter", {"letter": "t"})
+    async def test_tools_render_results(self):
+        """Test that each lookup/list/filter tool renders the API payload."""
+        cases = [
+            ("list_meals_by_first_letter", {"letter": "t"}, {"meals": [MOCK_MEAL]},
+             ["Teriyaki Chicken", "Found 1 meal(s)", "What would you like to do?"]),
+            ("lookup_meal_by_id", {"meal_id": "52772"}, {"meals": [MOCK_MEAL]},
+             ["Teriyaki Chicken", "52772", "What would you like to do?"]),
+            ("get_random_meal", {}, {"meals": [MOCK_MEAL]},
+             ["random meal", "Teriyaki Chicken", "What would you like to do?"]),
+            ("list_all_categories", {}, {"categories": [MOCK_CATEGORY]},
+             ["Seafood", "Found 1 categories", "What would you like to do?",
+              "See recipes in any specific category?"]),
+            ("list_category_names", {},
+             {"meals": [{"strCategory": "Beef"}, {"strCategory": "Chicken"}, {"strCategory": "Dessert"}]},
+             ["Beef", "Chicken", "Dessert", "(3)"]),
+            ("list_area_names", {},
+             {"meals": [{"strArea": "Italian"}, {"strArea": "Chinese"}, {"strArea": "Mexican"}]},
+             ["Italian", "Chinese", "(3)"]),
+            ("list_all_ingredients", {},
+             {"meals": [
+                 {"strIngredient": "Chicken", "strDescription": "Poultry meat"},
+                 {"strIngredient": "Salt", "strDescription": ""},
+             ]},
+             ["Chicken", "Poultry meat", "Salt"]),
+            ("filter_by_ingredient", {"ingredient": "chicken"},
+             {"meals": [
+                 {"strMeal": "Chicken Soup", "idMeal": "123", "strMealThumb": "img1.jpg"},
+                 {"strMeal": "Chicken Curry", "idMeal": "456", "strMealThumb": "img2.jpg"},
+             ]},
+             ["Found 2 meal(s)", "Chicken Soup", "Chicken Curry", "What would you like to do?",
+              "See any specific recipe?"]),
+            ("filter_by_category", {"category": "Seafood"},
+             {"meals": [{"strMeal": "Salmon Fillet", "idMeal": "789", "strMealThumb": "salmon.jpg"}]},
+             ["Seafood", "Salmon Fillet", "What would you like to do?"]),
+            ("filter_by_area", {"area": "Italian"},
+             {"meals": [{"strMeal": "Spaghetti Carbonara", "idMeal": "999", "strMealThumb": "pasta.jpg"}]},
+             ["Italian", "Spaghetti Carbonara", "What would you like to do?"]),
+        ]
         
-        self.assertEqual(len(result), 1)
-        self.assertIn("Teriyaki Chicken", result[0].text)
-        self.assertIn("Found 1 meal(s)", result[0].text)
-        self.assertIn("What would you like to do?", result[0].text)
-    
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_list_meals_by_first_letter_invalid(self, mock_client):
+        for tool, args, payload, expected in cases:
+            with self.subTest(tool=tool):
+                self.respond_with(payload)
+                
+                result = await handle_api_tool(tool, args)
+                
+                self.assertEqual(len(result), 1)
+                for text in expected:
+                    self.assertIn(text, result[0].text)
+    
+    async def test_list_meals_by_first_letter_invalid(self):
         """Test listing meals with invalid letter input."""
         result = await handle_api_tool("list_meals_by_first_letter", {"letter": "123"})
         
@@ -270,33 +376,14 @@ class TestAPIToolHandlers(unittest.IsolatedAsyncioTestCase):
         self.assertIn("Invalid input", result[0].text)
         self.assertIn("single letter (A-Z)", result[0].text)
     
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_list_meals_by_first_letter_multiple_chars(self, mock_client):
+    async def test_list_meals_by_first_letter_multiple_chars(self):
         """Test listing meals with multiple character input."""
         result = await handle_api_tool("list_meals_by_first_letter", {"letter": "abc"})
         
         self.assertEqual(len(result), 1)
         self.assertIn("Invalid input", result[0].text)
     
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_lookup_meal_by_id(self, mock_client):
-        """Test looking up a meal by ID."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"meals": [self.mock_meal]}
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
-        
-        result = await handle_api_tool("lookup_meal_by_id", {"meal_id": "52772"})
-        
-        self.assertEqual(len(result), 1)
-        self.assertIn("Teriyaki Chicken", result[0].text)
-        self.assertIn("52772", result[0].text)
-        self.assertIn("What would you like to do?", result[0].text)
-    
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_lookup_meal_by_id_invalid_format(self, mock_client):
+    async def test_lookup_meal_by_id_invalid_format(self):
         """Test looking up meal with invalid ID format."""
         result = await handle_api_tool("lookup_meal_by_id", {"meal_id": "abc"})
         
@@ -304,140 +391,18 @@ class TestAPIToolHandlers(unittest.IsolatedAsyncioTestCase):
         self.assertIn("Invalid meal ID", result[0].text)
         self.assertIn("numeric ID", result[0].text)
     
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_lookup_meal_by_id_not_found(self, mock_client):
+    async def test_lookup_meal_by_id_not_found(self):
         """Test looking up a non-existent meal ID."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"meals": None}
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
+        self.respond_with({"meals": None})
         
         result = await handle_api_tool("lookup_meal_by_id", {"meal_id": "99999"})
         
         self.assertEqual(len(result), 1)
         self.assertIn("No meal found", result[0].text)
     
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_get_random_meal(self, mock_client):
-        """Test getting a random meal."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"meals": [self.mock_meal]}
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
-        
-        result = await handle_api_tool("get_random_meal", {})
-        
-        self.assertEqual(len(result), 1)
-        self.assertIn("random meal", result[0].text)
-        self.assertIn("Teriyaki Chicken", result[0].text)
-        self.assertIn("What would you like to do?", result[0].text)
-    
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_list_all_categories(self, mock_client):
-        """Test listing all categories."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"categories": [self.mock_category]}
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
-        
-        result = await handle_api_tool("list_all_categories", {})
-        
-        self.assertEqual(len(result), 1)
-        self.assertIn("Seafood", result[0].text)
-        self.assertIn("Found 1 categories", result[0].text)
-        self.assertIn("What would you like to do?", result[0].text)
-        self.assertIn("See recipes in any specific category?", result[0].text)
-    
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_list_category_names(self, mock_client):
-        """Test listing category names."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "meals": [
-                {"strCategory": "Beef"},
-                {"strCategory": "Chicken"},
-                {"strCategory": "Dessert"},
-            ]
-        }
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
-        
-        result = await handle_api_tool("list_category_names", {})
-        
-        self.assertEqual(len(result), 1)
-        self.assertIn("Beef", result[0].text)
-        self.assertIn("Chicken", result[0].text)
-        self.assertIn("Dessert", result[0].text)
-        self.assertIn("(3)", result[0].text)
-    
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_list_area_names(self, mock_client):
-        """Test listing area/cuisine names."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "meals": [
-                {"strArea": "Italian"},
-                {"strArea": "Chinese"},
-                {"strArea": "Mexican"},
-            ]
-        }
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
-        
-        result = await handle_api_tool("list_area_names", {})
-        
-        self.assertEqual(len(result), 1)
-        self.assertIn("Italian", result[0].text)
-        self.assertIn("Chinese", result[0].text)
-        self.assertIn("(3)", result[0].text)
-    
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_list_all_ingredients(self, mock_client):
-        """Test listing all ingredients."""
-        mock_ingredients = [
-            {"strIngredient": "Chicken", "strDescription": "Poultry meat"},
-            {"strIngredient": "Salt", "strDescription": ""},
-        ]
-        
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"meals": mock_ingredients}
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
-        
-        result = await handle_api_tool("list_all_ingredients", {})
-        
-        self.assertEqual(len(result), 1)
-        self.assertIn("Chicken", result[0].text)
-        self.assertIn("Poultry meat", result[0].text)
-        self.assertIn("Salt", result[0].text)
-    
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_list_all_ingredients_truncation(self, mock_client):
+    async def test_list_all_ingredients_truncation(self):
         """Test that ingredients list shows truncation message."""
-        # Create 150 ingredients
-        mock_ingredients = [
-            {"strIngredient": f"Ingredient{i}", "strDescription": ""}
-            for i in range(150)
-        ]
-        
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"meals": mock_ingredients}
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
+        self.respond_with({"meals": MANY_INGREDIENTS})
         
         result = await handle_api_tool("list_all_ingredients", {})
         
@@ -445,142 +410,160 @@ class TestAPIToolHandlers(unittest.IsolatedAsyncioTestCase):
         self.assertIn("and 50 more ingredients", result[0].text)
         self.assertIn("showing first 100", result[0].text)
     
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_filter_by_ingredient(self, mock_client):
-        """Test filtering meals by ingredient."""
-        mock_meals = [
-            {"strMeal": "Chicken Soup", "idMeal": "123", "strMealThumb": "img1.jpg"},
-            {"strMeal": "Chicken Curry", "idMeal": "456", "strMealThumb": "img2.jpg"},
-        ]
-        
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"meals": mock_meals}
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
-        
-        result = await handle_api_tool("filter_by_ingredient", {"ingredient": "chicken"})
-        
-        self.assertEqual(len(result), 1)
-        self.assertIn("Found 2 meal(s)", result[0].text)
-        self.assertIn("Chicken Soup", result[0].text)
-        self.assertIn("Chicken Curry", result[0].text)
-        self.assertIn("What would you like to do?", result[0].text)
-        self.assertIn("See any specific recipe?", result[0].text)
-    
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_filter_by_category(self, mock_client):
-        """Test filtering meals by category."""
-        mock_meals = [
-            {"strMeal": "Salmon Fillet", "idMeal": "789", "strMealThumb": "salmon.jpg"},
-        ]
-        
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"meals": mock_meals}
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
-        
-        result = await handle_api_tool("filter_by_category", {"category": "Seafood"})
-        
-        self.assertEqual(len(result), 1)
-        self.assertIn("Seafood", result[0].text)
-        self.assertIn("Salmon Fillet", result[0].text)
-        self.assertIn("What would you like to do?", result[0].text)
-    
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_filter_by_area(self, mock_client):
-        """Test filtering meals by area/cuisine."""
-        mock_meals = [
-            {"strMeal": "Spaghetti Carbonara", "idMeal": "999", "strMealThumb": "pasta.jpg"},
-        ]
-        
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"meals": mock_meals}
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
-        
-        result = await handle_api_tool("filter_by_area", {"area": "Italian"})
-        
-        self.assertEqual(len(result), 1)
-        self.assertIn("Italian", result[0].text)
-        self.assertIn("Spaghetti Carbonara", result[0].text)
-        self.assertIn("What would you like to do?", result[0].text)
-    
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_filter_no_results(self, mock_client):
+    async def test_filter_no_results(self):
         """Test filter returning no results."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"meals": None}
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
+        self.respond_with({"meals": None})
         
         result = await handle_api_tool("filter_by_ingredient", {"ingredient": "unicorn"})
         
         self.assertEqual(len(result), 1)
         self.assertIn("No meals found", result[0].text)
     
+    async def test_client_is_reused(self):
+        """Test that repeated tool calls share one HTTP client."""
+        client = api_tools._client
+        self.respond_with({"meals": [MOCK_MEAL]})
+        
+        with patch('src.tools.api_tools.httpx.AsyncClient') as mock_client:
+            await handle_api_tool("lookup_meal_by_id", {"meal_id": "52772"})
+            await handle_api_tool("lookup_meal_by_id", {"meal_id": "52773"})
+        
+        mock_client.assert_not_called()
+        self.assertIs(api_tools._get_client(), client)
+        self.assertEqual(len(self.requests), 2)
+    
     @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_unknown_tool(self, mock_client):
+    async def test_client_requests_compressed_responses(self, mock_client):
+        """Test that the shared client asks TheMealDB for gzip bodies."""
+        await api_tools.close_api_client()  # Close setUp's client rather than dropping it
+        mock_client.return_value.aclose = AsyncMock()
+        api_tools._get_client()
+        
+        headers = mock_client.call_args.kwargs["headers"]
+        self.assertIn("gzip", headers["Accept-Encoding"])
+        self.assertEqual(headers["User-Agent"], "mealdb-mcp/1.0")
+    
+    async def test_repeat_call_served_from_cache(self):
+        """Test that identical lookups only hit the API once."""
+        self.respond_with({"meals": [MOCK_MEAL]})
+        
+        first = await handle_api_tool("lookup_meal_by_id", {"meal_id": "52772"})
+        second = await handle_api_tool("lookup_meal_by_id", {"meal_id": "52772"})
+        
+        self.assertEqual(first[0].text, second[0].text)
+        self.assertEqual(len(self.requests), 1)
+    
+    @patch('src.tools.api_tools.time.monotonic')
+    async def test_cache_entry_expires(self, mock_monotonic):
+        """Test that cached responses are refetched after their TTL."""
+        self.respond_with({"meals": [MOCK_MEAL]})
+        
+        mock_monotonic.return_value = 1000.0
+        await handle_api_tool("filter_by_area", {"area": "Japanese"})
+        mock_monotonic.return_value = 1000.0 + api_tools._CACHE_TTL + 1
+        await handle_api_tool("filter_by_area", {"area": "Japanese"})
+        
+        self.assertEqual(len(self.requests), 2)
+    
+    @patch('src.tools.api_tools.time.monotonic')
+    async def test_expired_entry_revalidated_with_etag(self, mock_monotonic):
+        """Test that a 304 reply to a conditional GET reuses the cached body."""
+        first = _response({"meals": [{"strArea": "Japanese"}]}, headers={"ETag": '"v1"'})
+        not_modified = _response(None, status_code=304)
+        not_modified.raise_for_status = MagicMock()
+        
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=[first, not_modified])
+        
+        mock_monotonic.return_value = 1000.0
+        data = await api_tools._get_json(client, "/list.php", {"a": "list"})
+        mock_monotonic.return_value = 1000.0 + api_tools._CACHE_TTL + 1
+        revalidated = await api_tools._get_json(client, "/list.php", {"a": "list"})
+        
+        self.assertEqual(revalidated, data)
+        self.assertEqual(client.get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+        not_modified.raise_for_status.assert_not_called()
+    
+    async def test_random_meal_not_cached(self):
+        """Test that get_random_meal always goes to the API."""
+        self.respond_with({"meals": [MOCK_MEAL]})
+        
+        await handle_api_tool("get_random_meal", {})
+        await handle_api_tool("get_random_meal", {})
+        
+        self.assertEqual(len(self.requests), 2)
+    
+    async def test_concurrent_requests_are_bounded(self):
+        """Test that no more than the allowed number of requests run at once."""
+        in_flight = 0
+        peak = 0
+        
+        async def fake_get(path, params=None, headers=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _response({"meals": None})
+        
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=fake_get)
+        
+        await api_tools.close_api_client()  # Start from a fresh semaphore
+        with patch.object(api_tools, '_MAX_CONCURRENT_REQUESTS', 2):
+            await asyncio.gather(*(
+                api_tools._get_json(client, "/search.php", {"s": str(i)}) for i in range(6)
+            ))
+        
+        self.assertEqual(client.get.call_count, 6)
+        self.assertEqual(peak, 2)
+    
+    async def test_unknown_tool(self):
         """Test handling unknown tool name."""
         result = await handle_api_tool("unknown_tool", {})
         
         self.assertIsNone(result)
     
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_api_error_handling(self, mock_client):
+    async def test_api_error_handling(self):
         """Test error handling when API call fails."""
-        mock_get = AsyncMock(side_effect=Exception("Network error"))
-        mock_client.return_value.__aenter__.return_value.get = mock_get
+        self.respond_with(Exception("Network error"))
         
         result = await handle_api_tool("search_meal_by_name", {"name": "chicken"})
         
         self.assertEqual(len(result), 1)
         self.assertIn("Unexpected error", result[0].text)
         self.assertIn("Network error", result[0].text)
+    
+    async def test_cancellation_propagates(self):
+        """Test that cancelling a tool call is not reported as an error."""
+        self.respond_with(asyncio.CancelledError())
+        
+        with self.assertRaises(asyncio.CancelledError):
+            await handle_api_tool("search_meal_by_name", {"name": "chicken"})
 
 
-class TestEdgeCases(unittest.IsolatedAsyncioTestCase):
+class TestEdgeCases(MockTransportTestCase):
     """Test edge cases and error conditions."""
     
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_empty_meal_name(self, mock_client):
+    async def test_empty_meal_name(self):
         """Test searching with empty meal name."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"meals": None}
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
+        self.respond_with({"meals": None})
         
         result = await handle_api_tool("search_meal_by_name", {"name": ""})
         
         self.assertEqual(len(result), 1)
         # Should handle gracefully
     
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_malformed_response(self, mock_client):
+    async def test_malformed_response(self):
         """Test handling malformed API response."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {}  # Missing 'meals' key
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
+        self.respond_with({})  # Missing 'meals' key
         
         result = await handle_api_tool("search_meal_by_name", {"name": "test"})
         
         self.assertEqual(len(result), 1)
         self.assertIn("No meals found", result[0].text)
     
-    @patch('src.tools.api_tools.httpx.AsyncClient')
-    async def test_meal_with_special_characters(self, mock_client):
+    async def test_meal_with_special_characters(self):
         """Test handling meal names with special characters."""
         special_meal = {
             "idMeal": "123",
@@ -588,12 +571,7 @@ class TestEdgeCases(unittest.IsolatedAsyncioTestCase):
             "strMealThumb": "image.jpg",
         }
         
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"meals": [special_meal]}
-        mock_response.raise_for_status = MagicMock()
-        
-        mock_get = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.get = mock_get
+        self.respond_with({"meals": [special_meal]})
         
         result = await handle_api_tool("search_meal_by_name", {"name": "test"})
         
@@ -601,35 +579,33 @@ class TestEdgeCases(unittest.IsolatedAsyncioTestCase):
         # Should handle special characters gracefully
 
 
-def run_tests():
-    """Run all tests."""
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-    
-    # Add all test classes
-    suite.addTests(loader.loadTestsFromTestCase(TestFormatters))
-    suite.addTests(loader.loadTestsFromTestCase(TestToolDefinitions))
-    suite.addTests(loader.loadTestsFromTestCase(TestAPIToolHandlers))
-    suite.addTests(loader.loadTestsFromTestCase(TestEdgeCases))
-    
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
-    
-    return result
+class TestRequestSlots(unittest.TestCase):
+    """Test the upstream request limit across event loops."""
+    
+    def test_semaphore_survives_new_event_loop(self):
+        """Test that contending the limit works again after close_api_client on a new loop."""
+        async def fake_get(path, params=None, headers=None):
+            await asyncio.sleep(0.001)
+            return _response({"meals": None})
+        
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=fake_get)
+        
+        async def burst():
+            # More requests than slots, so callers wait and the semaphore binds to this loop
+            try:
+                await asyncio.gather(*(
+                    api_tools._get_json(client, "/search.php", {"s": str(i)}, ttl=0)
+                    for i in range(api_tools._MAX_CONCURRENT_REQUESTS * 2)
+                ))
+            finally:
+                await api_tools.close_api_client()
+        
+        asyncio.run(burst())
+        asyncio.run(burst())
+        
+        self.assertEqual(client.get.call_count, api_tools._MAX_CONCURRENT_REQUESTS * 4)
 
 
 if __name__ == "__main__":
-    result = run_tests()
-    
-    # Print summary
-    print("\n" + "=" * 70)
-    print("TEST SUMMARY")
-    print("=" * 70)
-    print(f"Tests run: {result.testsRun}")
-    print(f"Successes: {result.testsRun - len(result.failures) - len(result.errors)}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    print("=" * 70)
-    
-    # Exit with appropriate code
-    exit(0 if result.wasSuccessful() else 1)
\ No newline at end of file
+    unittest.main(buffer=True)
@@ -8,16 +8,15 @@ import asyncio
 import tempfile
 import shutil
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock, AsyncMock
 import json
+import httpx
 import os
+import time
+from io import BytesIO
 
-# Import the module to test
-import sys
-from pathlib import Path
-
-# Add the parent directory to the path so we can import from src
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from PIL import Image as PILImage
 
 # Fixed imports
 from src.tools.local.tools import (
@@ -31,37 +30,104 @@ from src.tools.local.config import load_recipes_dir, save_recipes_dir, RECIPES_D
 from src.tools.local import api as local_api
 import src.tools.local.tools as local_tools
 import src.tools.local.config as config
+import src.tools.local.pdf_recipe as pdf_recipe
+import src.tools.local.categories as categories
+import src.tools.local._http as local_http
+
+# Keep test files in RAM when a writable tmpfs is available; None falls back
+# to the default temp directory
+TEMP_ROOT = "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+
+# One scratch directory per module run; each test gets its own subdirectory
+# and everything is removed once in tearDownModule
+_module_temp_dir = None
+
+
+def setUpModule():
+    global _module_temp_dir
+    _module_temp_dir = tempfile.mkdtemp(dir=TEMP_ROOT)
+
+
+def tearDownModule():
+    shutil.rmtree(_module_temp_dir, ignore_errors=True)
+
+
+# Shared read-only sample data, built once at import
+TEST_MEAL = {
+    "strMeal": "Test Recipe",
+    "strCategory": "Dessert",
+    "strArea": "American",
+    "strTags": "Sweet,Baked",
+    "strIngredient1": "Flour",
+    "strMeasure1": "2 cups",
+    "strIngredient2": "Sugar",
+    "strMeasure2": "1 cup",
+    "strIngredient3": "",
+    "strMeasure3": "",
+    "strInstructions": "Mix and bake at 350F for 30 minutes.",
+    "strMealThumb": "https://example.com/image.jpg",
+}
+
+MOCK_MEAL = {
+    "strMeal": "Spaghetti Carbonara",
+    "strCategory": "Pasta",
+    "strArea": "Italian",
+    "strTags": "Pasta,Italian",
+    "strIngredient1": "Spaghetti",
+    "strMeasure1": "400g",
+    "strIngredient2": "Bacon",
+    "strMeasure2": "200g",
+    "strIngredient3": "Eggs",
+    "strMeasure3": "3",
+    "strIngredient4": "Parmesan",
+    "strMeasure4": "100g",
+    "strIngredient5": "",
+    "strMeasure5": "",
+    "strInstructions": "Cook pasta. Fry bacon. Mix with eggs and cheese.",
+    "strMealThumb": "https://example.com/carbonara.jpg",
+}
 
 
 class TestIngredientCategories(unittest.TestCase):
     """Test ingredient categorization."""
     
-    def test_produce_category(self):
-        self.assertEqual(get_ingredient_category("tomato"), "Produce")
-        self.assertEqual(get_ingredient_category("Fresh Tomatoes"), "Produce")
-        self.assertEqual(get_ingredient_category("ONION"), "Produce")
-    
-    def test_meat_category(self):
-        self.assertEqual(get_ingredient_category("chicken breast"), "Meat & Seafood")
-        self.assertEqual(get_ingredient_category("Ground Beef"), "Meat & Seafood")
-        self.assertEqual(get_ingredient_category("salmon fillet"), "Meat & Seafood")
-    
-    def test_dairy_category(self):
-        self.assertEqual(get_ingredient_category("milk"), "Dairy & Eggs")
-        self.assertEqual(get_ingredient_category("Cheddar Cheese"), "Dairy & Eggs")
-        self.assertEqual(get_ingredient_category("eggs"), "Dairy & Eggs")
-    
-    def test_pantry_category(self):
-        self.assertEqual(get_ingredient_category("flour"), "Pantry & Dry")
-        self.assertEqual(get_ingredient_category("rice"), "Pantry & Dry")
-        self.assertEqual(get_ingredient_category("olive oil"), "Pantry & Dry")
-    
-    def test_spices_category(self):
-        self.assertEqual(get_ingredient_category("paprika"), "Spices")
-        self.assertEqual(get_ingredient_category("black pepper"), "Spices")
+    def test_categories(self):
+        cases = [
+            ("tomato", "Produce"),
+            ("Fresh Tomatoes", "Produce"),
+            ("ONION", "Produce"),
+            ("chicken breast", "Meat & Seafood"),
+            ("Ground Beef", "Meat & Seafood"),
+            ("salmon fillet", "Meat & Seafood"),
+            ("milk", "Dairy & Eggs"),
+            ("Cheddar Cheese", "Dairy & Eggs"),
+            ("eggs", "Dairy & Eggs"),
+            ("flour", "Pantry & Dry"),
+            ("rice", "Pantry & Dry"),
+            ("olive oil", "Pantry & Dry"),
+            ("paprika", "Spices"),
+            ("black pepper", "Spices"),
+            ("unknown ingredient", "Other"),
+            # Multi-word keywords win
+            ("Red Bell Pepper", "Produce"),
+            ("green beans", "Produce"),
+            ("Fish Sauce", "Pantry & Dry"),
+            # Otherwise the first keyword in table order wins
+            ("Butter Beans", "Pantry & Dry"),
+            ("Apple cider vinegar", "Produce"),
+        ]
+        
+        for ingredient, expected in cases:
+            with self.subTest(ingredient=ingredient):
+                self.assertEqual(get_ingredient_category(ingredient), expected)
     
-    def test_unknown_category(self):
-        self.assertEqual(get_ingredient_category("unknown ingredient"), "Other")
+    def test_lookup_cache_ignores_case(self):
+        categories._category_for.cache_clear()
+        
+        get_ingredient_category("Tomato")
+        get_ingredient_category("TOMATO")
+        
+        self.assertEqual(categories._category_for.cache_info().hits, 1)
 
 
 class TestDirectoryManagement(unittest.TestCase):
@@ -69,15 +135,14 @@ class TestDirectoryManagement(unittest.TestCase):
     
     def setUp(self):
         """Set up temporary directory for testing."""
-        self.temp_dir = tempfile.mkdtemp()
+        self.temp_dir = tempfile.mkdtemp(dir=_module_temp_dir)
         self.test_config = Path(self.temp_dir) / "test_config.json"
         
     def tearDown(self):
-        """Clean up temporary directory."""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+        """Reset the cached config."""
+        config._cached_config = None
     
-    @patch('src.tools.local.config.CONFIG_FILE')
+    @patch.object(config, 'CONFIG_FILE')
     def test_save_recipes_dir(self, mock_config_file):
         """Test saving recipes directory to config."""
         mock_config_file.__str__ = lambda x: str(self.test_config)
@@ -89,13 +154,25 @@ class TestDirectoryManagement(unittest.TestCase):
         self.assertEqual(result, test_path)
         self.assertTrue(test_path.exists())
 
+    def test_config_written_atomically_and_cached(self):
+        """Saved config is renamed into place and later loads skip the disk."""
+        test_path = Path(self.temp_dir) / "recipes"
+        with patch.object(config, 'CONFIG_FILE', self.test_config):
+            save_recipes_dir(str(test_path))
+            
+            self.assertEqual(json.loads(self.test_config.read_text()), {"recipes_dir": str(test_path)})
+            self.assertFalse(self.test_config.with_suffix(".tmp").exists())
+            
+            self.test_config.unlink()
+            self.assertEqual(load_recipes_dir(), test_path)
+
 
-class TestToolDefinitions(unittest.TestCase):
+class TestToolDefinitions(unittest.IsolatedAsyncioTestCase):
     """Test tool definitions and schemas."""
     
-    def test_get_tool_definitions(self):
+    async def test_get_tool_definitions(self):
         """Test that all tools are defined correctly."""
-        tools = get_local_tool_definitions()
+        tools = await get_local_tool_definitions()
         
         # Should have 11 tools
         self.assertEqual(len(tools), 11)
@@ -117,56 +194,38 @@ class TestToolDefinitions(unittest.TestCase):
         ]
         self.assertEqual(tool_names, expected_names)
     
-    def test_tool_schemas(self):
+    async def test_tool_schemas(self):
         """Test that each tool has proper input schema."""
-        tools = get_local_tool_definitions()
+        tools = await get_local_tool_definitions()
         
         for tool in tools:
             self.assertIsNotNone(tool.inputSchema)
             self.assertEqual(tool.inputSchema["type"], "object")
 
 
-class TestPDFGeneration(unittest.TestCase):
+class TestPDFGeneration(unittest.IsolatedAsyncioTestCase):
     """Test PDF generation functions."""
     
     def setUp(self):
         """Set up test data and temporary directory."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.test_meal = {
-            "strMeal": "Test Recipe",
-            "strCategory": "Dessert",
-            "strArea": "American",
-            "strTags": "Sweet,Baked",
-            "strIngredient1": "Flour",
-            "strMeasure1": "2 cups",
-            "strIngredient2": "Sugar",
-            "strMeasure2": "1 cup",
-            "strIngredient3": "",
-            "strMeasure3": "",
-            "strInstructions": "Mix and bake at 350F for 30 minutes.",
-            "strMealThumb": "https://example.com/image.jpg",
-        }
+        self.temp_dir = tempfile.mkdtemp(dir=_module_temp_dir)
+        # Offline client: the image download gets a 404, so the PDF is built without one
+        local_http._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(404))
+        )
     
-    def tearDown(self):
-        """Clean up temporary directory."""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+    async def asyncTearDown(self):
+        """Close the test's HTTP client."""
+        await local_http.close_local_client()
     
     async def test_create_recipe_pdf(self):
         """Test creating a recipe PDF."""
         filepath = Path(self.temp_dir) / "test_recipe.pdf"
         
-        # Mock the httpx AsyncClient to avoid network calls
-        with patch('src.tools.local.pdf_recipe.httpx.AsyncClient') as mock_client:
-            # Make the async context manager return a mock that raises an error
-            # This simulates no image being downloaded
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(side_effect=Exception("No image"))
-            
-            await create_recipe_pdf(self.test_meal, filepath)
+        await create_recipe_pdf(TEST_MEAL, filepath)
         
-        # Check that PDF was created
-        self.assertTrue(filepath.exists())
-        self.assertGreater(filepath.stat().st_size, 0)
+        # Check that a PDF was created
+        self.assertTrue(filepath.read_bytes().startswith(b"%PDF-"))
     
     def test_create_shopping_list_pdf(self):
         """Test creating a shopping list PDF."""
@@ -188,9 +247,8 @@ class TestPDFGeneration(unittest.TestCase):
         
         create_shopping_list_pdf(meal_names, ingredients, filepath)
         
-        # Check that PDF was created
-        self.assertTrue(filepath.exists())
-        self.assertGreater(filepath.stat().st_size, 0)
+        # Check that a PDF was created
+        self.assertTrue(filepath.read_bytes().startswith(b"%PDF-"))
 
 
 class TestLocalToolHandlers(unittest.IsolatedAsyncioTestCase):
@@ -198,56 +256,390 @@ class TestLocalToolHandlers(unittest.IsolatedAsyncioTestCase):
     
     def setUp(self):
         """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
-        
-        # Mock meal data
-        self.mock_meal = {
-            "strMeal": "Spaghetti Carbonara",
-            "strCategory": "Pasta",
-            "strArea": "Italian",
-            "strTags": "Pasta,Italian",
-            "strIngredient1": "Spaghetti",
-            "strMeasure1": "400g",
-            "strIngredient2": "Bacon",
-            "strMeasure2": "200g",
-            "strIngredient3": "Eggs",
-            "strMeasure3": "3",
-            "strIngredient4": "Parmesan",
-            "strMeasure4": "100g",
-            "strIngredient5": "",
-            "strMeasure5": "",
-            "strInstructions": "Cook pasta. Fry bacon. Mix with eggs and cheese.",
-            "strMealThumb": "https://example.com/carbonara.jpg",
-        }
+        self.temp_dir = tempfile.mkdtemp(dir=_module_temp_dir)
+        # Offline client: every image download gets a 404, so PDFs are built without one
+        local_http._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(404))
+        )
+        # Handlers write a stub PDF; TestPDFGeneration covers the real renderers
+        patcher = patch.multiple(
+            local_tools,
+            create_recipe_pdf=AsyncMock(side_effect=lambda meal, filepath: filepath.write_bytes(b"%PDF-")),
+            create_shopping_list_pdf=MagicMock(side_effect=lambda names, ingredients, filepath: filepath.write_bytes(b"%PDF-")),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
     
-    def tearDown(self):
-        """Clean up test environment."""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+    async def asyncTearDown(self):
+        """Close the test's HTTP client."""
+        await local_http.close_local_client()
     
-    @patch('src.tools.local.tools.fetch_meal_data')
-    @patch('src.tools.local.pdf_recipe.httpx.AsyncClient')
-    async def test_save_recipe_to_file(self, mock_client, mock_fetch):
+    async def test_save_recipe_to_file(self):
         """Test saving a recipe to file."""
-        mock_fetch.return_value = self.mock_meal
-        mock_client.return_value.__aenter__.return_value.get = AsyncMock(side_effect=Exception('No image'))  # No image
+        # Serve the lookup through the real client path; everything else 404s
+        def handler(request):
+            if request.url.path.endswith("/lookup.php"):
+                return httpx.Response(200, content=json.dumps({"meals": [MOCK_MEAL]}))
+            return httpx.Response(404)
         
-        # Temporarily override the RECIPES_DIR in the config module
-        original_dir = config.RECIPES_DIR
-        config.RECIPES_DIR = Path(self.temp_dir)
+        local_http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        local_api._meal_cache.clear()
         
-        try:
+        with patch.object(config, 'RECIPES_DIR', Path(self.temp_dir)):
             result = await handle_local_tool(
                 "save_recipe_to_file",
                 {"meal_id": "12345"}
             )
+        
+        self.assertEqual(len(result), 1)
+        self.assertIn("Recipe saved successfully", result[0].text)
+        self.assertIn("Spaghetti Carbonara", result[0].text)
+    
+    async def test_recipe_pdf_embeds_image(self):
+        """Test that a downloaded image is embedded without a temp file."""
+        jpeg = BytesIO()
+        PILImage.new('RGB', (800, 600), (200, 80, 40)).save(jpeg, format='JPEG')
+        local_http._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=jpeg.getvalue()))
+        )
+        
+        filepath = Path(self.temp_dir) / "with_image.pdf"
+        with patch('tempfile.NamedTemporaryFile') as mock_tempfile:
+            await create_recipe_pdf(MOCK_MEAL, filepath)
+        await local_http.close_local_client()
+        
+        mock_tempfile.assert_not_called()
+        self.assertIn(b'/Subtype /Image', filepath.read_bytes())
+    
+    async def test_thumbnail_cached_on_disk(self):
+        """Test that a second PDF for the same meal reuses the cached thumbnail."""
+        jpeg = BytesIO()
+        PILImage.new('RGB', (800, 600), (200, 80, 40)).save(jpeg, format='JPEG')
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, content=jpeg.getvalue())
+        
+        local_http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        cache_dir = Path(self.temp_dir) / "thumbs"
+        meal = dict(MOCK_MEAL, idMeal="52772")
+        
+        with patch.object(pdf_recipe, '_THUMB_CACHE_DIR', cache_dir):
+            await create_recipe_pdf(meal, Path(self.temp_dir) / "first.pdf")
+            await create_recipe_pdf(meal, Path(self.temp_dir) / "second.pdf")
+        await local_http.close_local_client()
+        
+        self.assertEqual(len(requests), 1)
+        self.assertTrue((cache_dir / "52772.jpg").exists())
+        self.assertIn(b'/Subtype /Image', (Path(self.temp_dir) / "second.pdf").read_bytes())
+        self.assertEqual(cache_dir.stat().st_mode & 0o777, 0o700)
+        self.assertEqual([p.name for p in cache_dir.iterdir()], ["52772.jpg"])
+    
+    async def test_thumbnail_cache_refuses_symlinked_dir(self):
+        """Test that a symlinked cache directory is neither read nor written."""
+        jpeg = BytesIO()
+        PILImage.new('RGB', (400, 300), (40, 80, 200)).save(jpeg, format='JPEG')
+        local_http._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=jpeg.getvalue()))
+        )
+        target = Path(self.temp_dir) / "elsewhere"
+        target.mkdir()
+        (target / "52772.jpg").write_bytes(b"planted")
+        cache_dir = Path(self.temp_dir) / "thumbs"
+        cache_dir.symlink_to(target)
+        filepath = Path(self.temp_dir) / "symlinked.pdf"
+        
+        with patch.object(pdf_recipe, '_THUMB_CACHE_DIR', cache_dir):
+            await create_recipe_pdf(dict(MOCK_MEAL, idMeal="52772"), filepath)
+        await local_http.close_local_client()
+        
+        self.assertEqual([p.name for p in target.iterdir()], ["52772.jpg"])
+        self.assertEqual((target / "52772.jpg").read_bytes(), b"planted")
+        self.assertIn(b'/Subtype /Image', filepath.read_bytes())
+    
+    async def test_thumbnail_cache_refuses_foreign_dir(self):
+        """Test that a cache directory owned by another user is not written to."""
+        cache_dir = Path(self.temp_dir) / "thumbs"
+        cache_dir.mkdir()
+        
+        with patch.object(pdf_recipe, '_THUMB_CACHE_DIR', cache_dir), \
+                patch.object(os, 'getuid', return_value=cache_dir.stat().st_uid + 1):
+            pdf_recipe._store_thumbnail(cache_dir / "52772.jpg", b"jpeg")
+            self.assertIsNone(pdf_recipe._load_cached_thumbnail(cache_dir / "52772.jpg"))
+        
+        self.assertEqual(list(cache_dir.iterdir()), [])
+    
+    @patch('src.tools.local._http.httpx.AsyncHTTPTransport')
+    @patch('src.tools.local._http.httpx.AsyncClient')
+    async def test_image_client_is_reused(self, mock_client, mock_transport):
+        """Test that consecutive recipe PDFs share one HTTP client."""
+        local_http._client = None
+        mock_client.return_value.stream = MagicMock(side_effect=Exception('No image'))
+        mock_client.return_value.aclose = AsyncMock()
+        
+        await create_recipe_pdf(MOCK_MEAL, Path(self.temp_dir) / "one.pdf")
+        await create_recipe_pdf(MOCK_MEAL, Path(self.temp_dir) / "two.pdf")
+        
+        mock_client.assert_called_once()
+        self.assertEqual(mock_client.return_value.stream.call_count, 2)
+    
+    async def test_recipe_pdf_null_measure(self):
+        """Test that a null measure field doesn't break PDF generation."""
+        meal = dict(MOCK_MEAL, strMeasure1=None, strIngredient6=None)
+        filepath = Path(self.temp_dir) / "null_measure.pdf"
+        
+        await create_recipe_pdf(meal, filepath)
+        
+        self.assertGreater(filepath.stat().st_size, 0)
+    
+    @patch.object(local_tools, 'fetch_meal_data')
+    async def test_create_shopping_list_fetches_meals_concurrently(self, mock_fetch):
+        """Test that all meals are requested before any fetch completes."""
+        started = []
+        
+        async def fake_fetch(meal_id):
+            started.append(meal_id)
+            await asyncio.sleep(0)
+            self.assertEqual(len(started), 3)  # every fetch is already in flight
+            return dict(MOCK_MEAL, strMeal=f"Meal {meal_id}")
+        
+        mock_fetch.side_effect = fake_fetch
+        
+        result = await handle_local_tool(
+            "create_shopping_list",
+            {"meal_ids": ["1", "2", "3"], "directory": self.temp_dir, "filename": "list"}
+        )
+        
+        self.assertIn("Shopping list created successfully", result[0].text)
+        self.assertLess(result[0].text.index("Meal 1"), result[0].text.index("Meal 3"))
+        self.assertTrue((Path(self.temp_dir) / "list.pdf").exists())
+
+    @patch.object(local_tools, 'fetch_meal_data')
+    async def test_create_shopping_list_cancels_fetches_on_failure(self, mock_fetch):
+        """Test that an unknown meal ID is reported and the other fetches are cancelled."""
+        cancelled = []
+        
+        async def fake_fetch(meal_id):
+            if meal_id == "2":
+                raise ValueError(f"Meal ID {meal_id} not found")
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(meal_id)
+                raise
+        
+        mock_fetch.side_effect = fake_fetch
+        
+        result = await handle_local_tool(
+            "create_shopping_list",
+            {"meal_ids": ["1", "2", "3"], "directory": self.temp_dir, "filename": "list"}
+        )
+        
+        self.assertEqual(result[0].text, "Error: Meal ID 2 not found")
+        self.assertCountEqual(cancelled, ["1", "3"])
+        self.assertFalse((Path(self.temp_dir) / "list.pdf").exists())
+    
+    @patch.object(local_tools, 'create_shopping_list_pdf')
+    @patch.object(local_tools, 'fetch_meal_data')
+    async def test_create_shopping_list_merges_ingredients(self, mock_fetch, mock_pdf):
+        """Test that ingredients are merged case-insensitively across meals."""
+        other = {"strMeal": "Fried Eggs", "strIngredient1": " eggs ", "strMeasure1": None}
+        mock_fetch.side_effect = [MOCK_MEAL, other]
+
+        await handle_local_tool(
+            "create_shopping_list",
+            {"meal_ids": ["1", "2"], "directory": self.temp_dir, "filename": "list"}
+        )
+
+        all_ingredients = mock_pdf.call_args[0][1]
+        self.assertEqual(all_ingredients["eggs"], {
+            'original': "Eggs",
+            'measures': ["3"],
+            'recipes': ["Spaghetti Carbonara", "Fried Eggs"]
+        })
+        self.assertEqual(len(all_ingredients), 4)
+
+    def test_aggregate_ingredients(self):
+        """Test merging ingredients without fetching or rendering anything."""
+        other = {"strIngredient1": "spaghetti", "strMeasure1": "200g"}
+        
+        meal_names, all_ingredients = local_tools._aggregate_ingredients([MOCK_MEAL, other])
+        
+        self.assertEqual(meal_names, ["Spaghetti Carbonara", "Unknown"])
+        self.assertEqual(list(all_ingredients), ["spaghetti", "bacon", "eggs", "parmesan"])
+        self.assertEqual(all_ingredients["spaghetti"], {
+            'original': "Spaghetti",
+            'measures': ["400g", "200g"],
+            'recipes': ["Spaghetti Carbonara", "Unknown"]
+        })
+    
+    @patch.object(local_tools, 'create_shopping_list_pdf')
+    @patch.object(local_tools, 'fetch_meal_data')
+    async def test_create_shopping_list_dedupes_meal_ids(self, mock_fetch, mock_pdf):
+        """Test that a repeated meal ID is fetched and listed once."""
+        mock_fetch.return_value = MOCK_MEAL
+
+        result = await handle_local_tool(
+            "create_shopping_list",
+            {"meal_ids": ["1", "2", "1"], "directory": self.temp_dir, "filename": "list"}
+        )
+
+        self.assertEqual([c.args[0] for c in mock_fetch.call_args_list], ["1", "2"])
+        self.assertIn("Recipes (2):", result[0].text)
+
+    async def test_list_saved_recipes(self):
+        """Test listing saved recipe PDFs grouped by category."""
+        root = Path(self.temp_dir)
+        (root / "Pasta").mkdir()
+        (root / "Pasta" / "Carbonara.pdf").write_bytes(b"x" * 2048)
+        (root / "Pasta" / "notes.txt").write_text("skip me")
+        (root / "Dessert").mkdir()
+        (root / "Dessert" / "Brownies.pdf").write_bytes(b"x")
+        (root / ".hidden").mkdir()
+        (root / ".hidden" / "Secret.pdf").write_bytes(b"x")
+        
+        with patch.object(config, 'RECIPES_DIR', root):
+            result = await handle_local_tool("list_saved_recipes", {})
+        
+        text = result[0].text
+        self.assertLess(text.index("Dessert (1)"), text.index("Pasta (1)"))
+        self.assertIn("1. Carbonara\n      Size: 2.0 KB", text)
+        self.assertNotIn("notes", text)
+        self.assertNotIn("Secret", text)
+        self.assertIn("Total recipes: 2", text)
+    
+    async def test_list_shopping_lists(self):
+        """Test listing shopping list PDFs in name order."""
+        root = Path(self.temp_dir)
+        (root / "shopping_list_2.pdf").write_bytes(b"x" * 1024)
+        (root / "shopping_list_1.pdf").write_bytes(b"x")
+        (root / "Carbonara.pdf").write_bytes(b"x")
+
+        with patch.object(config, 'RECIPES_DIR', root):
+            result = await handle_local_tool("list_shopping_lists", {})
+
+        text = result[0].text
+        self.assertTrue(text.startswith("Found 2 shopping list(s):\n\n1. shopping_list_1.pdf\n"))
+        self.assertIn("2. shopping_list_2.pdf\n   Size: 1.0 KB | Modified: ", text)
+        self.assertNotIn("Carbonara", text)
+        self.assertTrue(text.endswith(f"Directory: {root}"))
+
+    async def test_shopping_list_scan_cached(self):
+        """Test that an unchanged directory is not rescanned."""
+        root = Path(self.temp_dir)
+        (root / "shopping_list_1.pdf").write_bytes(b"x")
+        # Age the directory past the mtime granularity so its scan is cacheable
+        os.utime(root, (time.time() - 10, time.time() - 10))
+        first = local_tools._shopping_list_paths(root)
+
+        with patch('src.tools.local.tools.os.scandir', side_effect=AssertionError("rescanned")):
+            self.assertEqual(local_tools._shopping_list_paths(root), first)
+
+        with patch.object(config, 'RECIPES_DIR', root):
+            await handle_local_tool("delete_shopping_list", {"filename": "shopping_list_1"})
+        self.assertEqual(local_tools._shopping_list_paths(root), ())
+
+    def test_shopping_list_scan_not_cached_within_mtime_tick(self):
+        """Test that files added in the same mtime tick as a scan are still found."""
+        root = Path(self.temp_dir)
+        (root / "shopping_list_1.pdf").write_bytes(b"x")
+        stamp = time.time()
+        os.utime(root, (stamp, stamp))
+        local_tools._shopping_list_paths(root)
+        
+        # An outside writer adds a file without moving the directory mtime
+        (root / "shopping_list_2.pdf").write_bytes(b"x")
+        os.utime(root, (stamp, stamp))
+        
+        self.assertEqual(len(local_tools._shopping_list_paths(root)), 2)
+    
+    def test_shopping_list_scan_cache_expires(self):
+        """Test that a cached scan is redone after the max age."""
+        root = Path(self.temp_dir)
+        os.utime(root, (time.time() - 10, time.time() - 10))
+        local_tools._shopping_list_paths(root)
+        
+        with patch.object(local_tools, '_SHOPPING_LIST_CACHE_MAX_AGE', 0), \
+                patch('src.tools.local.tools.os.scandir', side_effect=AssertionError("rescanned")):
+            with self.assertRaises(AssertionError):
+                local_tools._shopping_list_paths(root)
+    
+    async def test_delete_all_shopping_lists(self):
+        """Test that only shopping list PDFs are deleted."""
+        root = Path(self.temp_dir)
+        for name in ("shopping_list_1.pdf", "shopping_list_2.pdf", "Carbonara.pdf"):
+            (root / name).write_bytes(b"x")
+
+        with patch.object(config, 'RECIPES_DIR', root):
+            result = await handle_local_tool("delete_all_shopping_lists", {})
+
+        self.assertIn("Successfully deleted 2 shopping list(s)", result[0].text)
+        self.assertEqual([p.name for p in root.iterdir()], ["Carbonara.pdf"])
+
+    @patch.object(local_tools, 'fetch_meal_data')
+    async def test_saved_recipe_index(self, mock_fetch):
+        """Test that saves are indexed and deletes use and update the index."""
+        mock_fetch.return_value = MOCK_MEAL
+        root = Path(self.temp_dir)
+        
+        with patch.object(config, 'RECIPES_DIR', root):
+            await handle_local_tool("save_recipe_to_file", {"meal_id": "12345"})
+            self.assertEqual(local_tools._load_index(), {"Spaghetti Carbonara.pdf": "Pasta"})
+
+            # Served from memory until the index file changes
+            with patch.object(Path, 'read_bytes', side_effect=AssertionError("index reread")):
+                self.assertEqual(local_tools._load_index(), {"Spaghetti Carbonara.pdf": "Pasta"})
+
+            with patch.object(Path, 'iterdir', side_effect=AssertionError("index not used")):
+                result = await handle_local_tool("delete_saved_recipe", {"filename": "Spaghetti Carbonara"})
             
-            self.assertEqual(len(result), 1)
-            self.assertIn("Recipe saved successfully", result[0].text)
-            self.assertIn("Spaghetti Carbonara", result[0].text)
-        finally:
-            # Restore original directory
-            config.RECIPES_DIR = original_dir
+            self.assertIn("Recipe deleted successfully", result[0].text)
+            self.assertFalse((root / "Pasta" / "Spaghetti Carbonara.pdf").exists())
+            self.assertEqual(local_tools._load_index(), {})
+    
+    @patch.object(local_tools, 'fetch_meal_data')
+    async def test_save_recipe_to_custom_directory(self, mock_fetch):
+        """Test saving into a custom directory with a custom filename."""
+        mock_fetch.return_value = MOCK_MEAL
+        custom_dir = Path(self.temp_dir) / "custom"
+        
+        result = await handle_local_tool(
+            "save_recipe_to_file",
+            {"meal_id": "12345", "filename": "dinner", "directory": str(custom_dir)}
+        )
+        
+        expected = custom_dir / "Pasta" / "dinner.pdf"
+        self.assertIn(f"File: {expected}", result[0].text)
+        self.assertTrue(expected.exists())
+
+    @patch.object(local_tools, 'fetch_meal_data')
+    async def test_save_recipe_null_category(self, mock_fetch):
+        """Test that a null category from the API falls back to Uncategorized."""
+        mock_fetch.return_value = dict(MOCK_MEAL, strCategory=None)
+
+        with patch.object(config, 'RECIPES_DIR', Path(self.temp_dir)):
+            result = await handle_local_tool("save_recipe_to_file", {"meal_id": "12345"})
+
+        self.assertIn("Category: Uncategorized", result[0].text)
+        self.assertTrue((Path(self.temp_dir) / "Uncategorized" / "Spaghetti Carbonara.pdf").exists())
+
+    async def test_save_recipe_by_name_uses_shared_client(self):
+        """Test that the recipe search goes through the shared local client."""
+        def handler(request):
+            if request.url.path.endswith("/search.php"):
+                self.assertEqual(request.url.params["s"], "carbonara")
+                return httpx.Response(200, json={"meals": [MOCK_MEAL]})
+            return httpx.Response(404)  # No image
+        
+        local_http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        
+        with patch.object(config, 'RECIPES_DIR', Path(self.temp_dir)):
+            result = await handle_local_tool("save_recipe_by_name", {"recipe_name": "carbonara"})
+        await local_http.close_local_client()
+        
+        self.assertIn("Recipe saved successfully", result[0].text)
+        self.assertTrue((Path(self.temp_dir) / "Pasta" / "Spaghetti Carbonara.pdf").exists())
     
     async def test_unknown_tool(self):
         """Test handling unknown tool name."""
@@ -261,45 +653,59 @@ class TestEdgeCases(unittest.IsolatedAsyncioTestCase):
     
     def setUp(self):
         """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
+        self.temp_dir = tempfile.mkdtemp(dir=_module_temp_dir)
     
-    def tearDown(self):
-        """Clean up test environment."""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
-
-
-def run_tests():
-    """Run all tests."""
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-    
-    # Add all test classes
-    suite.addTests(loader.loadTestsFromTestCase(TestIngredientCategories))
-    suite.addTests(loader.loadTestsFromTestCase(TestDirectoryManagement))
-    suite.addTests(loader.loadTestsFromTestCase(TestToolDefinitions))
-    suite.addTests(loader.loadTestsFromTestCase(TestPDFGeneration))
-    suite.addTests(loader.loadTestsFromTestCase(TestLocalToolHandlers))
-    suite.addTests(loader.loadTestsFromTestCase(TestEdgeCases))
-    
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    async def test_fetch_meal_data_cached_by_id(self):
+        """Fetching the same meal twice only calls the API once."""
+        mock_response = SimpleNamespace(
+            content=json.dumps({"meals": [{"idMeal": "52772", "strMeal": "Teriyaki Chicken"}]}).encode(),
+            raise_for_status=lambda: None,
+        )
+        mock_client = MagicMock()
+        mock_client.get = AsyncMock(return_value=mock_response)
+        
+        local_api._meal_cache.clear()
+        try:
+            with patch.object(local_api, 'get_client', return_value=mock_client):
+                first = await local_api.fetch_meal_data("52772")
+                second = await local_api.fetch_meal_data("52772")
+        finally:
+            local_api._meal_cache.clear()
+        
+        self.assertEqual(first, second)
+        self.assertEqual(mock_client.get.call_count, 1)
     
-    return result
+    async def test_fetch_meal_data_concurrency_capped(self):
+        """Concurrent meal lookups never exceed the request limit."""
+        in_flight = peak = 0
+        
+        async def fake_get(url, params=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return SimpleNamespace(
+                content=json.dumps({"meals": [{"idMeal": params["i"]}]}).encode(),
+                raise_for_status=lambda: None,
+            )
+        
+        mock_client = MagicMock()
+        mock_client.get = AsyncMock(side_effect=fake_get)
+        
+        await local_http.close_local_client()  # Start from a fresh semaphore
+        local_api._meal_cache.clear()
+        try:
+            with patch.object(local_api, 'get_client', return_value=mock_client), \
+                    patch.object(local_http, '_MAX_CONCURRENT_REQUESTS', 2):
+                await asyncio.gather(*(local_api.fetch_meal_data(str(i)) for i in range(6)))
+        finally:
+            local_api._meal_cache.clear()
+            await local_http.close_local_client()
+        
+        self.assertEqual(mock_client.get.call_count, 6)
+        self.assertEqual(peak, 2)
 
 
 if __name__ == "__main__":
-    result = run_tests()
-    
-    # Print summary
-    print("\n" + "=" * 70)
-    print("TEST SUMMARY")
-    print("=" * 70)
-    print(f"Tests run: {result.testsRun}")
-    print(f"Successes: {result.testsRun - len(result.failures) - len(result.errors)}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    print("=" * 70)
-    
-    # Exit with appropriate code
-    exit(0 if result.wasSuccessful() else 1)
\ No newline at end of file
+    unittest.main(buffer=True)